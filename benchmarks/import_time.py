@@ -0,0 +1,53 @@
+"""
+Benchmark CLI startup cost.
+
+Imports `lambda_packer.cli` in a fresh interpreter with `-X importtime` and
+prints the slowest modules by cumulative import time. The budget enforced by
+tests/test_import_time.py is shown alongside for reference.
+
+Usage:
+    python benchmarks/import_time.py --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+BUDGET_MS = 150
+
+
+def collect(module: str) -> list[tuple[int, int, str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="lambda_packer.cli")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    rows = collect(args.module)
+    total_ms = next(c for c, _, n in rows if n.strip() == args.module) / 1000
+
+    print(f"{'cumulative (ms)':>16} {'self (ms)':>10}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"{cumulative_us / 1000:>16.1f} {self_us / 1000:>10.1f}  {name}")
+    print(f"\n{args.module}: {total_ms:.1f} ms (budget {BUDGET_MS} ms)")
+
+
+if __name__ == "__main__":
+    main()
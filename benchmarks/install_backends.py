@@ -0,0 +1,78 @@
+"""
+Benchmark requirement install time for each installer backend.
+
+Builds the same requirements file once per backend with BuildKit's layer cache
+disabled, so every run performs a full resolve + install. The installer's cache
+mount is kept between runs, so the first round measures a cold cache and the
+following rounds a warm one.
+
+Usage:
+    python benchmarks/install_backends.py path/to/requirements.txt \\
+        --runtime python3.12 --platform linux/amd64 --rounds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from lambda_packer.builders.dockerfile import DockerfileGenerator
+from lambda_packer.config import Installer
+
+
+def time_build(df_content: str, context: Path, platform: str, dest: Path) -> float:
+    dockerfile = context / "Dockerfile"
+    dockerfile.write_text(df_content)
+    cmd = [
+        "docker", "buildx", "build",
+        "--no-cache",
+        "--platform", platform,
+        "-f", str(dockerfile),
+        "--output", f"type=local,dest={dest}",
+        str(context),
+    ]
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("requirements", type=Path)
+    parser.add_argument("--runtime", default="python3.12")
+    parser.add_argument("--platform", default="linux/amd64")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    df_gen = DockerfileGenerator()
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        context = Path(tmp) / "context"
+        (context / "src").mkdir(parents=True)
+        shutil.copy2(args.requirements, context / "requirements.txt")
+
+        for installer in Installer:
+            df_content = df_gen.generate(
+                runtime=args.runtime, requirements=True, installer=installer
+            )
+            timings = []
+            for round_no in range(args.rounds):
+                dest = Path(tmp) / f"out-{installer.value}-{round_no}"
+                timings.append(time_build(df_content, context, args.platform, dest))
+                print(f"{installer.value:>4} round {round_no + 1}: {timings[-1]:.2f}s")
+            results[installer.value] = timings
+
+    print("\nbackend   cold (s)   warm median (s)")
+    for name, timings in results.items():
+        warm = statistics.median(timings[1:]) if len(timings) > 1 else float("nan")
+        print(f"{name:<8} {timings[0]:>9.2f} {warm:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-import subprocess
 import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+from .progress import run_with_progress
 
 
 class BuildKitBuilder:
@@ -25,12 +26,14 @@ class BuildKitBuilder:
         cache_to: Optional[str] = None,
         cache_from: Optional[str] = None,
         push: bool = False,
-    ) -> None:
+    ) -> Dict:
         """
         Executes a BuildKit build.
         
         This method writes a temporary Dockerfile and calls 'docker buildx build'.
         It handles the logic for exporting to a local directory or loading into Docker.
+        Progress is read as rawjson and returned as per-step metrics
+        (see ProgressCollector.summary).
         """
 
         with tempfile.NamedTemporaryFile(
@@ -46,6 +49,7 @@ class BuildKitBuilder:
                 cmd += ["--builder", self.buildx_instance]
 
             cmd += ["--platform", ",".join(platforms)]
+            cmd += ["--progress", "rawjson"]
             cmd += ["-f", str(tmp_df_path)]
 
             if output_type == "local":
@@ -53,6 +57,15 @@ class BuildKitBuilder:
                 if not output_dest:
                     raise ValueError("output_dest is required for output_type='local'")
                 cmd += ["--output", f"type=local,dest={output_dest}"]
+            elif output_type == "oci":
+                # Used for multi-arch images that are not pushed: writes an OCI image
+                # layout (index.json + blobs/) holding every platform under one index.
+                if not output_dest:
+                    raise ValueError("output_dest is required for output_type='oci'")
+                cmd += ["--output", f"type=oci,dest={output_dest},tar=false"]
+                if tags:
+                    for tag in tags:
+                        cmd += ["-t", tag]
             elif output_type == "image":
                 if push:
                     # Push directly to the registry.
@@ -84,7 +97,7 @@ class BuildKitBuilder:
             cmd.append(str(context_path))
 
             print(f"Executing: {' '.join(cmd)}")
-            subprocess.run(cmd, check=True)
+            return run_with_progress(cmd)
 
         finally:
             # Cleanup the temporary Dockerfile.
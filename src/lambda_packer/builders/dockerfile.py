@@ -2,34 +2,53 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, List, Optional
 
-from jinja2 import Template
+if TYPE_CHECKING:
+    from jinja2 import Template
+
+    from ..lockfile import BaseImageLock
+
+# Image providing the static 'uv' binary. It is bind-mounted into the install
+# step rather than copied, so it never ends up in the artifact.
+UV_IMAGE = "ghcr.io/astral-sh/uv:0.9"
+
+# Dockerfile frontend named by the '# syntax=' directive. BuildKit runs it on the
+# build host rather than the target platform, so it is pinned by index digest.
+FRONTEND_IMAGE = "docker/dockerfile:1.4"
 
 # The core "compiler" template.
 # It uses multi-stage builds to:
 # 1. Build each layer in isolation (optimized for caching).
 # 2. Build the main lambda and merge the layers.
 # 3. Export to either a runnable OCI image or a flat filesystem (for ZIP).
-DOCKERFILE_TEMPLATE = """
-# syntax=docker/dockerfile:1.4
+DOCKERFILE_TEMPLATE = """# syntax={{ frontend_image }}
+{% macro install(installer) -%}
+{% if installer == "uv" -%}
+RUN --mount=from={{ uv_image }},source=/uv,target=/bin/uv \\
+    --mount=type=cache,target=/root/.cache/uv \\
+    UV_LINK_MODE=copy uv pip install --python python -r /tmp/requirements.txt --target .
+{%- else -%}
+RUN --mount=type=cache,target=/root/.cache/pip \\
+    pip install -r /tmp/requirements.txt -t .
+{%- endif %}
+{%- endmacro %}
 {% for layer_name in layers %}
-FROM python:{{ runtime_version }}-slim AS layer-{{ layer_name }}
+FROM {{ build_image }} AS layer-{{ layer_name }}
 WORKDIR /asset/python
 {% if layer_requirements[layer_name] %}
 COPY layer_{{ layer_name }}_requirements.txt /tmp/requirements.txt
-RUN --mount=type=cache,target=/root/.cache/pip \\
-    pip install -r /tmp/requirements.txt -t .
+{{ install(layer_installers.get(layer_name, installer)) }}
 {% endif %}
 COPY layer_{{ layer_name }}/ .
 {% endfor %}
 
-FROM python:{{ runtime_version }}-slim AS builder
+FROM {{ build_image }} AS builder
 WORKDIR /asset
 {% if requirements %}
 COPY requirements.txt /tmp/requirements.txt
-RUN --mount=type=cache,target=/root/.cache/pip \\
-    pip install -r /tmp/requirements.txt -t .
+{{ install(installer) }}
 {% endif %}
 COPY src/ .
 
@@ -42,7 +61,7 @@ COPY --from=layer-{{ layer_name }} /asset/python/ .
 # Final stage
 {% if is_image %}
 # For OCI images, we use the official AWS Lambda base image to ensure it's runnable.
-FROM public.ecr.aws/lambda/python:{{ runtime_version }}
+FROM {{ lambda_image }}
 WORKDIR ${LAMBDA_TASK_ROOT}
 COPY --from=builder /asset .
 {% if handler %}
@@ -58,11 +77,47 @@ COPY --from=builder /asset /
 """
 
 
+def build_image(runtime: str) -> str:
+    """Image the layer and builder stages run in."""
+    return f"python:{runtime.replace('python', '')}-slim"
+
+
+def lambda_image(runtime: str) -> str:
+    """AWS Lambda base image for runnable OCI image targets."""
+    return f"public.ecr.aws/lambda/python:{runtime.replace('python', '')}"
+
+
+def base_images(runtime: str, is_image: bool, installers: Iterable[str] = ()) -> List[str]:
+    """Every image a generated Dockerfile pulls for the given options."""
+    images = [build_image(runtime)]
+    if is_image:
+        images.append(lambda_image(runtime))
+    if "uv" in installers:
+        images.append(UV_IMAGE)
+    return images
+
+
+@lru_cache(maxsize=None)
+def compile_template(source: str) -> Template:
+    """
+    Compiles a Dockerfile template once per process.
+
+    Jinja2 is imported on first use, and every DockerfileGenerator built from the
+    same source shares the compiled template.
+    """
+    from jinja2 import Template
+
+    return Template(source)
+
+
 class DockerfileGenerator:
     """Generates a Dockerfile based on the component type and requirements."""
 
-    def __init__(self, template: Optional[str] = None):
-        self.template = Template(template or DOCKERFILE_TEMPLATE)
+    def __init__(
+        self, template: Optional[str] = None, lock: Optional[BaseImageLock] = None
+    ):
+        self.template = compile_template(template or DOCKERFILE_TEMPLATE)
+        self.lock = lock
 
     def generate(
         self,
@@ -72,6 +127,9 @@ class DockerfileGenerator:
         layer_requirements: Optional[dict[str, bool]] = None,
         is_image: bool = False,
         handler: Optional[str] = None,
+        installer: str = "pip",
+        layer_installers: Optional[dict[str, str]] = None,
+        platforms: Optional[List[str]] = None,
     ) -> str:
         """
         Renders the Dockerfile template.
@@ -83,12 +141,27 @@ class DockerfileGenerator:
             layer_requirements: Map of layer names to a boolean indicating if they have requirements.
             is_image: Whether to produce a runnable OCI image.
             handler: The Lambda handler name (required if is_image is True).
+            installer: Backend for the builder stage's requirements ('pip' or 'uv').
+            layer_installers: Map of layer names to their backend. Defaults to `installer`.
+            platforms: Build platforms, used to pick digests from the base image lock.
         """
+        def pinned(ref: str) -> str:
+            if self.lock and platforms:
+                return self.lock.pin(ref, platforms)
+            return ref
+
+        frontend_image = self.lock.pin(FRONTEND_IMAGE, []) if self.lock else FRONTEND_IMAGE
+
         return self.template.render(
-            runtime_version=runtime.replace("python", ""),
             requirements=requirements,
             layers=layers or [],
             layer_requirements=layer_requirements or {},
             is_image=is_image,
             handler=handler,
+            installer=installer,
+            layer_installers=layer_installers or {},
+            build_image=pinned(build_image(runtime)),
+            lambda_image=pinned(lambda_image(runtime)),
+            uv_image=pinned(UV_IMAGE),
+            frontend_image=frontend_image,
         )
@@ -0,0 +1,432 @@
+"""
+Direct BuildKit LLB backend for ZIP targets.
+
+Instead of rendering a Dockerfile per task and running 'docker buildx build' for
+each, all ZIP tasks are compiled into a single LLB graph (BuildKit's low-level
+build definition) and solved in one 'buildctl build' call against a buildkitd
+socket. Every task reads from one shared local context, so sources are uploaded
+once per run, and identical operations (e.g. pulling the same base image or
+installing the same layer) appear once in the graph.
+
+The graph mirrors DOCKERFILE_TEMPLATE's ZIP path. Image targets are not handled
+here, since their runtime config (ENTRYPOINT, CMD) comes from the Dockerfile
+frontend.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .dockerfile import UV_IMAGE, build_image
+from .progress import run_with_progress
+
+# Exec ops do not inherit image ENV in raw LLB; this matches python:*-slim.
+DEFAULT_ENV = ["PATH=/usr/local/bin:/usr/local/sbin:/usr/sbin:/usr/bin:/sbin:/bin"]
+
+# pb.Empty / pb.SkipOutput: "no input" (scratch) and "not an output".
+EMPTY = -1
+
+# pb.MountType
+MOUNT_CACHE = 3
+
+# Name of the shared local source passed to buildctl with --local.
+CONTEXT_NAME = "context"
+
+
+# --- Minimal protobuf (proto3) wire encoding ---------------------------------
+
+
+def _varint(value: int) -> bytes:
+    if value < 0:
+        value += 1 << 64
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _int(field: int, value: int) -> bytes:
+    """Varint field (int32/int64/bool/enum). Zero values are omitted, as in proto3."""
+    if not value:
+        return b""
+    return _varint(field << 3) + _varint(int(value))
+
+
+def _bytes(field: int, value) -> bytes:
+    """Length-delimited string/bytes field. Empty values are omitted."""
+    if not value:
+        return b""
+    if isinstance(value, str):
+        value = value.encode()
+    return _varint((field << 3) | 2) + _varint(len(value)) + value
+
+
+def _msg(field: int, payload: bytes) -> bytes:
+    """Embedded message field, emitted even when empty (needed for oneofs)."""
+    return _varint((field << 3) | 2) + _varint(len(payload)) + payload
+
+
+def _string_map(field: int, mapping: Dict[str, str]) -> bytes:
+    return b"".join(
+        _msg(field, _bytes(1, key) + _bytes(2, mapping[key])) for key in sorted(mapping)
+    )
+
+
+def _platform(platform: str) -> bytes:
+    parts = platform.split("/")
+    # pb.Platform: Architecture = 1, OS = 2, Variant = 3
+    return _bytes(1, parts[1]) + _bytes(2, parts[0]) + _bytes(3, "/".join(parts[2:]))
+
+
+def normalize_image(ref: str) -> str:
+    """Expands a short image reference the way the Docker CLI does."""
+    first, _, rest = ref.partition("/")
+    if not rest:
+        return f"docker.io/library/{ref}"
+    if "." not in first and ":" not in first and first != "localhost":
+        return f"docker.io/{ref}"
+    return ref
+
+
+# A reference to an op's output: (op digest, output index).
+State = Tuple[str, int]
+
+
+class LLBGraph:
+    """
+    Builds an LLB definition op by op.
+
+    Ops are content-addressed: each is identified by the SHA-256 of its encoded
+    bytes, so adding an identical op twice yields the same state.
+    """
+
+    def __init__(self):
+        self._ops: Dict[str, bytes] = {}
+        self._names: Dict[str, str] = {}
+
+    def _add(
+        self,
+        inputs: List[State],
+        kind: int,
+        payload: bytes,
+        platform: Optional[str],
+        name: Optional[str] = None,
+    ) -> State:
+        # pb.Op: inputs = 1, exec = 2, source = 3, file = 4, merge = 6, platform = 10
+        data = b"".join(_msg(1, _bytes(1, d) + _int(2, i)) for d, i in inputs)
+        data += _msg(kind, payload)
+        if platform:
+            data += _msg(10, _platform(platform))
+        digest = f"sha256:{hashlib.sha256(data).hexdigest()}"
+        self._ops.setdefault(digest, data)
+        if name:
+            self._names.setdefault(digest, name)
+        return digest, 0
+
+    def image(self, ref: str, platform: str) -> State:
+        identifier = f"docker-image://{normalize_image(ref)}"
+        return self._add([], 3, _bytes(1, identifier), platform, name=f"[{platform}] FROM {ref}")
+
+    def local(self, name: str) -> State:
+        attrs = {"local.sharedkeyhint": name}
+        payload = _bytes(1, f"local://{name}") + _string_map(2, attrs)
+        return self._add([], 3, payload, None, name=f"load {name}")
+
+    def mkdir(self, state: State, path: str, platform: str) -> State:
+        # pb.FileActionMkDir: path = 1, mode = 2, makeParents = 3, timestamp = 5
+        mkdir = _bytes(1, path) + _int(2, 0o755) + _int(3, True) + _int(5, -1)
+        # pb.FileAction: input = 1, secondaryInput = 2, output = 3, mkdir = 6
+        action = _int(1, 0) + _int(2, EMPTY) + _int(3, 0) + _msg(6, mkdir)
+        return self._add([state], 4, _msg(2, action), platform)
+
+    def copy(
+        self,
+        src: State,
+        src_path: str,
+        dest: Optional[State],
+        dest_path: str,
+        platform: Optional[str],
+        name: Optional[str] = None,
+    ) -> State:
+        """Copies src_path from `src` into `dest` (None for scratch), like COPY."""
+        # pb.FileActionCopy: src = 1, dest = 2, mode = 4, followSymlink = 5,
+        # dirCopyContents = 6, createDestPath = 8, allowWildcard = 9,
+        # allowEmptyWildcard = 10, timestamp = 11
+        copy = (
+            _bytes(1, src_path)
+            + _bytes(2, dest_path)
+            + _int(4, -1)
+            + _int(5, True)
+            + _int(6, True)
+            + _int(8, True)
+            + _int(9, True)
+            + _int(10, True)
+            + _int(11, -1)
+        )
+        if dest is None:
+            inputs, action = [src], _int(1, EMPTY) + _int(2, 0)
+        else:
+            inputs, action = [dest, src], _int(1, 0) + _int(2, 1)
+        action += _int(3, 0) + _msg(4, copy)
+        return self._add(inputs, 4, _msg(2, action), platform, name=name)
+
+    def run(
+        self,
+        state: State,
+        args: List[str],
+        cwd: str,
+        platform: str,
+        env: Optional[List[str]] = None,
+        caches: Optional[List[str]] = None,
+        binds: Optional[List[Tuple[State, str, str]]] = None,
+        name: Optional[str] = None,
+    ) -> State:
+        """
+        Runs a command on `state`, like RUN.
+
+        `caches` are cache mount targets (shared by id with the Dockerfile path);
+        `binds` are read-only (state, selector, dest) mounts.
+        """
+        # pb.Meta: args = 1, env = 2, cwd = 3
+        meta = b"".join(_bytes(1, a) for a in args)
+        meta += b"".join(_bytes(2, e) for e in DEFAULT_ENV + (env or []))
+        meta += _bytes(3, cwd)
+
+        # pb.Mount: input = 1, selector = 2, dest = 3, output = 4, readonly = 5,
+        # mountType = 6, cacheOpt = 20 (pb.CacheOpt: ID = 1)
+        inputs = [state]
+        mounts = [_msg(2, _int(1, 0) + _bytes(3, "/") + _int(4, 0))]
+        for bind_state, selector, dest in binds or []:
+            inputs.append(bind_state)
+            mounts.append(
+                _msg(
+                    2,
+                    _int(1, len(inputs) - 1)
+                    + _bytes(2, selector)
+                    + _bytes(3, dest)
+                    + _int(4, EMPTY)
+                    + _int(5, True),
+                )
+            )
+        for target in caches or []:
+            mounts.append(
+                _msg(
+                    2,
+                    _int(1, EMPTY)
+                    + _bytes(3, target)
+                    + _int(4, EMPTY)
+                    + _int(6, MOUNT_CACHE)
+                    + _msg(20, _bytes(1, target)),
+                )
+            )
+
+        payload = _msg(1, meta) + b"".join(mounts)
+        return self._add(inputs, 2, payload, platform, name=name)
+
+    def merge(self, states: List[State]) -> State:
+        # pb.MergeOp: inputs = 1 (pb.MergeInput: input = 1)
+        payload = b"".join(_msg(1, _int(1, i)) for i in range(len(states)))
+        return self._add(states, 6, payload, None, name="merge outputs")
+
+    def marshal(self, result: State) -> bytes:
+        """Encodes a pb.Definition whose result is `result`."""
+        # The final, op-less Op only points at the result.
+        sink = _msg(1, _bytes(1, result[0]) + _int(2, result[1]))
+        data = b"".join(_bytes(1, op) for op in self._ops.values())
+        data += _bytes(1, sink)
+        for digest in sorted(self._names):
+            # pb.OpMetadata: description = 2
+            description = _string_map(2, {"llb.customname": self._names[digest]})
+            data += _msg(2, _bytes(1, digest) + _msg(2, description))
+        return data
+
+
+class LLBBuilder:
+    """
+    Builds ZIP targets by submitting one LLB graph to buildkitd via 'buildctl'.
+
+    `addr` is the buildkitd address (e.g. unix:///run/buildkit/buildkitd.sock);
+    when omitted, buildctl uses $BUILDKIT_HOST or its default socket.
+    """
+
+    def __init__(self, addr: Optional[str] = None, lock=None):
+        self.addr = addr
+        self.lock = lock
+
+    def _image(self, ref: str, platform: str) -> str:
+        return self.lock.pin(ref, [platform]) if self.lock else ref
+
+    def definition(
+        self,
+        tasks,
+        pkg_cfg,
+        requirements: Dict[str, bool],
+        layer_requirements: Dict[str, bool],
+    ) -> bytes:
+        """
+        Compiles (target, platform) ZIP tasks into one LLB definition.
+
+        `requirements` and `layer_requirements` come from stage_shared_context.
+        Each task's filesystem ends up at '/<target name>/<arch>/' in the result.
+        """
+        from ..cli import resolve_layer_installers
+
+        graph = LLBGraph()
+        context = graph.local(CONTEXT_NAME)
+        outputs = []
+
+        for target, platform in tasks:
+            root = f"/targets/{target.name}"
+            label = f"{target.name} {platform}"
+            base = graph.image(self._image(build_image(target.runtime), platform), platform)
+            layer_installers = resolve_layer_installers(target, pkg_cfg)
+
+            # Layer ops depend only on the layer, base image and platform, so they
+            # are shared by every lambda using the layer.
+            layer_states = []
+            for layer_name in target.layers:
+                layer_root = f"/layers/{layer_name}"
+                layer_label = f"[{platform}] layer {layer_name}"
+                st = graph.mkdir(base, "/asset/python", platform)
+                if layer_requirements[layer_name]:
+                    st = graph.copy(
+                        context,
+                        f"{layer_root}/requirements.txt",
+                        st,
+                        "/tmp/requirements.txt",
+                        platform,
+                    )
+                    st = self._install(
+                        graph, st, "/asset/python", platform,
+                        layer_installers[layer_name],
+                        f"{layer_label}: install requirements",
+                    )
+                st = graph.copy(
+                    context, f"{layer_root}/src/", st, "/asset/python/", platform,
+                    name=f"{layer_label}: copy source",
+                )
+                layer_states.append(st)
+
+            st = graph.mkdir(base, "/asset", platform)
+            if requirements[target.name]:
+                st = graph.copy(context, f"{root}/requirements.txt", st, "/tmp/requirements.txt", platform)
+                st = self._install(
+                    graph, st, "/asset", platform, target.installer,
+                    f"[{label}] install requirements",
+                )
+            st = graph.copy(context, f"{root}/src/", st, "/asset/", platform, name=f"[{label}] copy source")
+            for layer_state in layer_states:
+                st = graph.copy(layer_state, "/asset/python/", st, "/asset/", platform)
+
+            arch = platform.split("/")[-1]
+            outputs.append(
+                graph.copy(st, "/asset/", None, f"/{target.name}/{arch}/", platform)
+            )
+
+        return graph.marshal(graph.merge(outputs))
+
+    def _install(self, graph, st, cwd, platform, installer, name):
+        if installer == "uv":
+            uv = graph.image(self._image(UV_IMAGE, platform), platform)
+            return graph.run(
+                st,
+                ["uv", "pip", "install", "--python", "python", "-r", "/tmp/requirements.txt", "--target", "."],
+                cwd,
+                platform,
+                env=["UV_LINK_MODE=copy"],
+                caches=["/root/.cache/uv"],
+                binds=[(uv, "/uv", "/bin/uv")],
+                name=name,
+            )
+        return graph.run(
+            st,
+            ["pip", "install", "-r", "/tmp/requirements.txt", "-t", "."],
+            cwd,
+            platform,
+            caches=["/root/.cache/pip"],
+            name=name,
+        )
+
+    def build(
+        self,
+        tasks,
+        pkg_cfg,
+        output_dest: Path,
+        cache_to: Optional[str] = None,
+        cache_from: Optional[str] = None,
+    ) -> Dict:
+        """
+        Stages every target into one context, solves the graph and exports the
+        result to `output_dest` (one '<name>/<arch>/' tree per task).
+        """
+        with tempfile.TemporaryDirectory() as temp_context_dir:
+            context = Path(temp_context_dir)
+            requirements, layer_requirements = stage_shared_context(tasks, pkg_cfg, context)
+            definition = self.definition(tasks, pkg_cfg, requirements, layer_requirements)
+
+            cmd = ["buildctl"]
+            if self.addr:
+                cmd += ["--addr", self.addr]
+            cmd += ["build", "--progress", "rawjson"]
+            cmd += ["--local", f"{CONTEXT_NAME}={context}"]
+            cmd += ["--output", f"type=local,dest={output_dest}"]
+            # Same cache option strings as buildx's --cache-to / --cache-from.
+            if cache_to:
+                cmd += ["--export-cache", cache_to]
+            if cache_from:
+                cmd += ["--import-cache", cache_from]
+
+            print(f"Executing: {' '.join(cmd)} < definition ({len(tasks)} tasks)")
+            return run_with_progress(cmd, input=definition)
+
+
+def stage_shared_context(tasks, pkg_cfg, context: Path) -> Tuple[Dict[str, bool], Dict[str, bool]]:
+    """
+    Stages every target and layer of `tasks` once into one context directory.
+
+    Targets go to 'targets/<name>/' and layers to 'layers/<name>/', each as 'src/'
+    plus an optional 'requirements.txt'. A layer is staged at the same path for
+    every lambda using it, so the ops reading it are identical and deduplicated.
+    Returns maps of target and layer names to whether each has requirements.
+    """
+
+    def stage(path, requirements_file, dest: Path) -> bool:
+        shutil.copytree(path, dest / "src", dirs_exist_ok=True)
+        if requirements_file:
+            shutil.copy2(requirements_file, dest / "requirements.txt")
+        return bool(requirements_file)
+
+    requirements: Dict[str, bool] = {}
+    layer_requirements: Dict[str, bool] = {}
+    for target, _ in tasks:
+        if target.name not in requirements:
+            requirements[target.name] = stage(
+                target.path, target.requirements, context / "targets" / target.name
+            )
+        for layer_name in target.layers:
+            if layer_name not in layer_requirements:
+                layer_cfg = pkg_cfg.layers[layer_name]
+                layer_requirements[layer_name] = stage(
+                    layer_cfg.path, layer_cfg.requirements, context / "layers" / layer_name
+                )
+    return requirements, layer_requirements
+
+
+def collect_outputs(tasks, output_dest: Path, dist: Path) -> None:
+    """Moves each task's tree from the solve output to dist/<name>/<arch>/asset."""
+    for target, platform in tasks:
+        arch = platform.split("/")[-1]
+        asset = dist / target.name / arch / "asset"
+        if asset.exists():
+            shutil.rmtree(asset)
+        asset.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(output_dest / target.name / arch), str(asset))
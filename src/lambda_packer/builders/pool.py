@@ -0,0 +1,182 @@
+"""Routing of build tasks across a pool of buildx builders."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .buildkit import BuildKitBuilder
+
+
+class _Usage:
+    """Task counters for one builder, over a pool's lifetime or one session."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.tasks = 0
+        self.native_tasks = 0
+        self.spilled_tasks = 0
+        self.busy_seconds = 0.0
+
+    def acquire(self) -> None:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+
+    def release(self, native: bool, elapsed: float) -> None:
+        self.active -= 1
+        self.tasks += 1
+        self.busy_seconds += elapsed
+        if native:
+            self.native_tasks += 1
+        else:
+            self.spilled_tasks += 1
+
+
+class _Slot:
+    """Book-keeping for one builder in the pool."""
+
+    def __init__(self, config):
+        self.config = config
+        self.builder = BuildKitBuilder(buildx_instance=config.name)
+        self.usage = _Usage()
+
+    def is_native(self, platforms: List[str]) -> bool:
+        return all(p in self.config.platforms for p in platforms)
+
+    @property
+    def free(self) -> bool:
+        return self.usage.active < self.config.concurrency
+
+    @property
+    def load(self) -> float:
+        return self.usage.active / self.config.concurrency
+
+
+class BuilderPool:
+    """
+    Sends each build to a buildx builder that runs its platform natively.
+
+    Exposes the same `build()` as BuildKitBuilder, so it can be passed wherever a
+    builder is expected. Each builder runs at most `concurrency` builds at once. A
+    task goes to the least loaded native builder with a free slot; if all of them
+    are saturated (or none exists), it spills over to any builder that accepts
+    emulated work, and otherwise waits for a slot.
+    """
+
+    def __init__(self, builders):
+        if not builders:
+            raise ValueError("BuilderPool requires at least one builder")
+        self._slots = [_Slot(config) for config in builders]
+        self._cond = threading.Condition()
+        self._started = time.monotonic()
+
+    @property
+    def concurrency(self) -> int:
+        """Builds the whole pool can run at once."""
+        return sum(s.config.concurrency for s in self._slots)
+
+    def build(self, platforms: List[str], **kwargs) -> Optional[Dict]:
+        return self._build(platforms, None, kwargs)
+
+    def session(self) -> PoolSession:
+        """A view of the pool that also counts its own tasks (e.g. one daemon request)."""
+        return PoolSession(self)
+
+    def _build(self, platforms: List[str], usage: Optional[Dict[str, _Usage]], kwargs) -> Optional[Dict]:
+        slot, native = self._acquire(platforms, usage)
+        started = time.monotonic()
+        try:
+            return slot.builder.build(platforms=platforms, **kwargs)
+        finally:
+            self._release(slot, native, time.monotonic() - started, usage)
+
+    def _acquire(self, platforms: List[str], usage: Optional[Dict[str, _Usage]]):
+        with self._cond:
+            while True:
+                slot = self._pick(platforms)
+                if slot is not None:
+                    native = slot.is_native(platforms)
+                    slot.usage.acquire()
+                    if usage is not None:
+                        usage.setdefault(slot.config.name, _Usage()).acquire()
+                    if not native:
+                        if any(s.is_native(platforms) for s in self._slots):
+                            reason = "native builders saturated"
+                        else:
+                            reason = "no native builder configured"
+                        print(
+                            f"Builder '{slot.config.name}' takes {','.join(platforms)} ({reason})"
+                        )
+                    return slot, native
+                self._cond.wait()
+
+    def _pick(self, platforms: List[str]) -> Optional[_Slot]:
+        native = [s for s in self._slots if s.is_native(platforms)]
+        candidates = [s for s in native if s.free]
+        if not candidates:
+            candidates = [s for s in self._slots if s.free and s.config.emulate]
+            if not native and not candidates:
+                # Nothing runs this platform natively or accepts emulated work:
+                # fall back to any builder rather than waiting forever.
+                candidates = [s for s in self._slots if s.free]
+        if not candidates:
+            return None
+        # min() keeps config order among equally loaded builders.
+        return min(candidates, key=lambda s: s.load)
+
+    def _release(
+        self, slot: _Slot, native: bool, elapsed: float, usage: Optional[Dict[str, _Usage]]
+    ) -> None:
+        with self._cond:
+            slot.usage.release(native, elapsed)
+            if usage is not None:
+                usage[slot.config.name].release(native, elapsed)
+            self._cond.notify_all()
+
+    def report(self) -> Dict[str, Dict]:
+        """Per-builder task counts and utilisation (busy time / available slot time)."""
+        with self._cond:
+            return self._report({s.config.name: s.usage for s in self._slots}, self._started)
+
+    def _report(self, usage: Dict[str, _Usage], started: float) -> Dict[str, Dict]:
+        # Caller holds self._cond.
+        wall = max(time.monotonic() - started, 1e-9)
+        report = {}
+        for s in self._slots:
+            u = usage.get(s.config.name) or _Usage()
+            report[s.config.name] = {
+                "platforms": list(s.config.platforms),
+                "concurrency": s.config.concurrency,
+                "tasks": u.tasks,
+                "native_tasks": u.native_tasks,
+                "spilled_tasks": u.spilled_tasks,
+                "peak_concurrency": u.peak,
+                "busy_s": round(u.busy_seconds, 3),
+                "utilisation": round(
+                    min(u.busy_seconds / (wall * s.config.concurrency), 1.0), 3
+                ),
+            }
+        return report
+
+
+class PoolSession:
+    """
+    Routes builds through a shared BuilderPool while counting only its own tasks.
+
+    Builder limits stay global to the pool; `report()` covers just the tasks sent
+    through this session, over the time since it was opened.
+    """
+
+    def __init__(self, pool: BuilderPool):
+        self._pool = pool
+        self._usage: Dict[str, _Usage] = {}
+        self._started = time.monotonic()
+
+    def build(self, platforms: List[str], **kwargs) -> Optional[Dict]:
+        return self._pool._build(platforms, self._usage, kwargs)
+
+    def report(self) -> Dict[str, Dict]:
+        with self._pool._cond:
+            return self._pool._report(self._usage, self._started)
@@ -0,0 +1,177 @@
+"""Step-level metrics from BuildKit's rawjson progress stream."""
+
+from __future__ import annotations
+
+import json
+import re
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TIMESTAMP = re.compile(
+    r"^(?P<base>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(?P<frac>\d+))?(?P<tz>Z|[+-]\d{2}:\d{2})$"
+)
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """
+    Converts a BuildKit RFC 3339 timestamp to epoch seconds.
+
+    BuildKit emits nanosecond precision, which datetime.fromisoformat does not
+    accept before Python 3.11, so the fraction is parsed separately.
+    """
+    if not value:
+        return None
+    match = _TIMESTAMP.match(value)
+    if not match:
+        return None
+    base = datetime.strptime(match["base"], "%Y-%m-%dT%H:%M:%S")
+    tz = match["tz"]
+    if tz == "Z":
+        base = base.replace(tzinfo=timezone.utc)
+    else:
+        base = datetime.fromisoformat(f"{match['base']}{tz}")
+    frac = float(f"0.{match['frac']}") if match["frac"] else 0.0
+    return base.timestamp() + frac
+
+
+class ProgressCollector:
+    """
+    Folds `docker buildx build --progress=rawjson` output into per-step metrics.
+
+    Each line is a SolveStatus carrying partial updates for vertexes (steps) and
+    their statuses (transfers). Updates for the same vertex are merged, so the
+    latest start/completion times and cache flag win.
+    """
+
+    def __init__(self):
+        self._vertexes: Dict[str, Dict] = {}
+        self._order: List[str] = []
+        # Highest byte count seen for each status, keyed by (vertex, status id).
+        self._transfers: Dict[tuple, int] = {}
+
+    def feed(self, line: str) -> List[Dict]:
+        """
+        Consumes one line of progress output.
+
+        Returns the steps that completed with this update. Lines that are not
+        rawjson (e.g. warnings printed by the CLI) are ignored.
+        """
+        try:
+            status = json.loads(line)
+        except ValueError:
+            return []
+        if not isinstance(status, dict):
+            return []
+
+        completed = []
+        for vertex in status.get("vertexes") or []:
+            digest = vertex.get("digest")
+            if not digest:
+                continue
+            current = self._vertexes.get(digest)
+            if current is None:
+                current = self._vertexes[digest] = {"name": vertex.get("name", digest)}
+                self._order.append(digest)
+            was_complete = "completed" in current
+            for key in ("started", "completed", "cached", "error"):
+                if vertex.get(key) is not None:
+                    current[key] = vertex[key]
+            if not was_complete and "completed" in current:
+                completed.append(self._step(digest))
+
+        for st in status.get("statuses") or []:
+            key = (st.get("vertex"), st.get("id"))
+            if st.get("current"):
+                self._transfers[key] = max(self._transfers.get(key, 0), st["current"])
+
+        return completed
+
+    def _step(self, digest: str) -> Dict:
+        vertex = self._vertexes[digest]
+        started = parse_timestamp(vertex.get("started"))
+        completed = parse_timestamp(vertex.get("completed"))
+        duration = completed - started if started and completed else 0.0
+        transferred = sum(
+            n for (v, _), n in self._transfers.items() if v == digest
+        )
+        step = {
+            "name": vertex["name"],
+            "duration_s": round(max(duration, 0.0), 3),
+            "cached": bool(vertex.get("cached")),
+            "bytes": transferred,
+        }
+        if vertex.get("error"):
+            step["error"] = vertex["error"]
+        return step
+
+    def steps(self) -> List[Dict]:
+        return [self._step(digest) for digest in self._order]
+
+    def summary(self) -> Dict:
+        """Per-target summary: every step plus cache and transfer totals."""
+        steps = self.steps()
+        cached = sum(1 for s in steps if s["cached"])
+        return {
+            "steps": steps,
+            "total_steps": len(steps),
+            "cached_steps": cached,
+            "cache_hit_ratio": round(cached / len(steps), 3) if steps else 0.0,
+            "bytes": sum(s["bytes"] for s in steps),
+        }
+
+
+def summarize_run(summaries: Iterable[Tuple[str, Dict]], slowest: int = 5) -> Dict:
+    """
+    Aggregates (label, summary) pairs into run-wide cache and timing figures.
+
+    The label identifies the task (e.g. 'billing (linux/arm64)') in the list of
+    slowest steps.
+    """
+    total = cached = transferred = 0
+    steps = []
+    for label, summary in summaries:
+        total += summary["total_steps"]
+        cached += summary["cached_steps"]
+        transferred += summary["bytes"]
+        steps.extend(dict(step, target=label) for step in summary["steps"])
+
+    steps.sort(key=lambda s: s["duration_s"], reverse=True)
+    return {
+        "total_steps": total,
+        "cached_steps": cached,
+        "cache_hit_ratio": round(cached / total, 3) if total else 0.0,
+        "bytes": transferred,
+        "slowest_steps": steps[:slowest],
+    }
+
+
+def run_with_progress(cmd: List[str], input: Optional[bytes] = None) -> Dict:
+    """
+    Runs a BuildKit client with rawjson progress on stderr.
+
+    Prints one line per finished step and returns ProgressCollector.summary().
+    `input` is written to the process's stdin (e.g. an LLB definition for buildctl).
+    """
+    collector = ProgressCollector()
+    stdin = subprocess.PIPE if input is not None else None
+    with subprocess.Popen(cmd, stdin=stdin, stderr=subprocess.PIPE) as proc:
+        if input is not None:
+            proc.stdin.write(input)
+            proc.stdin.close()
+        for raw in proc.stderr:
+            line = raw.decode(errors="replace")
+            if not line.lstrip().startswith("{"):
+                # Plain CLI output (warnings, errors) is passed through.
+                sys.stderr.write(line)
+                continue
+            for step in collector.feed(line):
+                state = "CACHED" if step["cached"] else f"{step['duration_s']:.1f}s"
+                print(f"  [{state}] {step['name']}")
+                if "error" in step:
+                    print(f"  ERROR: {step['error']}")
+
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return collector.summary()
@@ -3,20 +3,23 @@
 from __future__ import annotations
 
 import shutil
+import sys
 import tempfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 import click
 
+# Only lightweight, stdlib-backed modules are imported eagerly. The config schema
+# (pydantic, yaml), the Dockerfile generator (jinja2) and the planner are imported
+# inside the commands that need them, keeping `--help` and short commands fast.
 from .builders.buildkit import BuildKitBuilder
-from .builders.dockerfile import DockerfileGenerator
-from .config import ArtifactType, PackageConfig
 from .manifest import ManifestGenerator
 from .exporters.oci import OCIExporter
 from .exporters.zip import ZipExporter
-from .planner import Planner
+
+DEFAULT_SOCKET = Path(tempfile.gettempdir()) / "lambda-packer.sock"
 
 
 @click.group()
@@ -25,6 +28,103 @@ def cli():
     pass
 
 
+def stage_context(target, pkg_cfg, temp_context: Path):
+    """
+    Maps a target's files into the standardized context layout.
+
+    Returns whether the target has a requirements file, and a map of its layer
+    names to whether each layer has one.
+    """
+    # Map Lambda source to 'src/'
+    shutil.copytree(target.path, temp_context / "src", dirs_exist_ok=True)
+
+    # Map requirements to 'requirements.txt'
+    has_requirements = False
+    if target.requirements:
+        shutil.copy2(target.requirements, temp_context / "requirements.txt")
+        has_requirements = True
+
+    # Map Layers to 'layer_<name>/'
+    layer_requirements_map = {}
+    for layer_name in target.layers:
+        layer_cfg = pkg_cfg.layers[layer_name]
+        layer_dest = temp_context / f"layer_{layer_name}"
+        shutil.copytree(layer_cfg.path, layer_dest, dirs_exist_ok=True)
+
+        if layer_cfg.requirements:
+            shutil.copy2(
+                layer_cfg.requirements,
+                temp_context / f"layer_{layer_name}_requirements.txt",
+            )
+            layer_requirements_map[layer_name] = True
+        else:
+            layer_requirements_map[layer_name] = False
+
+    return has_requirements, layer_requirements_map
+
+
+@contextmanager
+def temporary_context(target, pkg_cfg):
+    """
+    Stages a target into a throwaway directory, removed once the build is done.
+
+    Yields the context path, whether it has requirements, and the layer
+    requirements map (see `stage_context`).
+    """
+    with tempfile.TemporaryDirectory() as temp_context_dir:
+        temp_context = Path(temp_context_dir)
+        has_requirements, layer_requirements_map = stage_context(
+            target, pkg_cfg, temp_context
+        )
+        yield temp_context, has_requirements, layer_requirements_map
+
+
+def with_metrics(metadata, metrics):
+    """Attaches BuildKit step metrics (see builders.progress) to artifact metadata."""
+    if metrics:
+        metadata["buildkit"] = metrics
+    return metadata
+
+
+def resolve_layer_installers(target, pkg_cfg):
+    """Maps each layer of a target to the installer backend its stage should use."""
+    return {
+        layer_name: pkg_cfg.layers[layer_name].installer or pkg_cfg.installer_default
+        for layer_name in target.layers
+    }
+
+
+def export_zip(target, platform, dist, zip_exporter, manifest, metrics=None):
+    """
+    Turns an exported dist/<name>/<arch>/asset tree into the target's ZIP.
+
+    Runs the optional prune pass first, then records the artifact in the manifest.
+    """
+    arch = platform.split("/")[-1]
+    asset = dist / target.name / arch / "asset"
+
+    metadata = {"platform": platform}
+    if target.prune:
+        # Optional pass: drop modules the handler can never import.
+        from .pruner import ReachabilityPruner
+
+        pruner = ReachabilityPruner(keep=target.prune.keep, verify=target.prune.verify)
+        report = pruner.prune(asset, target.handler)
+        print(
+            f"Pruned {report['removed_files']} files "
+            f"({report['removed_bytes']} bytes) from {target.name} ({platform})"
+        )
+        metadata["prune"] = report
+
+    # For ZIP targets, we run the deterministic exporter on the resulting filesystem.
+    zip_path = dist / f"{target.name}-{arch}.zip"
+    zip_exporter.export(asset, zip_path)
+    metadata["size"] = zip_path.stat().st_size
+    manifest.add_artifact(
+        target.name, target.type, zip_path.absolute(), with_metrics(metadata, metrics)
+    )
+
+
 def process_target_platform(
     target,
     platform,
@@ -37,6 +137,7 @@ def process_target_platform(
     zip_exporter,
     oci_exporter,
     manifest,
+    stager=None,
 ):
     """
     Orchestrates the build for a single target on a specific platform.
@@ -47,6 +148,8 @@ def process_target_platform(
     3. Triggers BuildKit.
     4. Handles the artifact export (ZIP or Image).
     """
+    from .config import ArtifactType
+
     arch = platform.split("/")[-1]
     platform_dist = dist / target.name / arch
     platform_dist.mkdir(parents=True, exist_ok=True)
@@ -54,36 +157,14 @@ def process_target_platform(
     print(f"Building {target.type} {target.name} ({platform})...")
 
     # 1. Prepare a clean build context.
-    # We use a temporary directory to avoid sending unnecessary files to Docker
+    # We use a dedicated directory to avoid sending unnecessary files to Docker
     # and to support absolute paths from external projects.
-    with tempfile.TemporaryDirectory() as temp_context_dir:
-        temp_context = Path(temp_context_dir)
-
-        # Map Lambda source to 'src/'
-        shutil.copytree(target.path, temp_context / "src", dirs_exist_ok=True)
-
-        # Map requirements to 'requirements.txt'
-        has_requirements = False
-        if target.requirements:
-            shutil.copy2(target.requirements, temp_context / "requirements.txt")
-            has_requirements = True
-
-        # Map Layers to 'layer_<name>/'
-        layer_requirements_map = {}
-        for layer_name in target.layers:
-            layer_cfg = pkg_cfg.layers[layer_name]
-            layer_dest = temp_context / f"layer_{layer_name}"
-            shutil.copytree(layer_cfg.path, layer_dest, dirs_exist_ok=True)
-
-            if layer_cfg.requirements:
-                shutil.copy2(
-                    layer_cfg.requirements,
-                    temp_context / f"layer_{layer_name}_requirements.txt",
-                )
-                layer_requirements_map[layer_name] = True
-            else:
-                layer_requirements_map[layer_name] = False
-
+    stager = stager or temporary_context
+    with stager(target, pkg_cfg) as (
+        temp_context,
+        has_requirements,
+        layer_requirements_map,
+    ):
         # 2. Generate the Dockerfile tailored for this standardized context.
         df_content = df_gen.generate(
             runtime=target.runtime,
@@ -92,11 +173,14 @@ def process_target_platform(
             layer_requirements=layer_requirements_map,
             is_image=(target.artifact_format == ArtifactType.IMAGE),
             handler=target.handler,
+            installer=target.installer,
+            layer_installers=resolve_layer_installers(target, pkg_cfg),
+            platforms=[platform],
         )
 
         # 3. Execute BuildKit build.
         if target.artifact_format == ArtifactType.ZIP:
-            builder.build(
+            metrics = builder.build(
                 dockerfile_content=df_content,
                 context_path=temp_context,
                 platforms=[platform],
@@ -106,12 +190,7 @@ def process_target_platform(
                 cache_from=cache,
             )
 
-            # For ZIP targets, we run the deterministic exporter on the resulting filesystem.
-            zip_path = dist / f"{target.name}-{arch}.zip"
-            zip_exporter.export(platform_dist / "asset", zip_path)
-            manifest.add_artifact(
-                target.name, target.type, zip_path, {"platform": platform}
-            )
+            export_zip(target, platform, dist, zip_exporter, manifest, metrics)
 
         elif target.artifact_format == ArtifactType.IMAGE:
             # For Image targets, we build and optionally push to a registry.
@@ -123,7 +202,7 @@ def process_target_platform(
             
             export_args = oci_exporter.get_export_args(tags=[tag], push=push)
             
-            builder.build(
+            metrics = builder.build(
                 dockerfile_content=df_content,
                 context_path=temp_context,
                 platforms=[platform],
@@ -131,7 +210,126 @@ def process_target_platform(
                 cache_from=cache,
                 **export_args
             )
-            manifest.add_artifact(target.name, target.type, tag, {"platform": platform})
+            manifest.add_artifact(
+                target.name, target.type, tag, with_metrics({"platform": platform}, metrics)
+            )
+
+
+def process_multi_arch_image(
+    target,
+    pkg_cfg,
+    dist,
+    cache,
+    push,
+    df_gen,
+    builder,
+    oci_exporter,
+    manifest,
+    stager=None,
+):
+    """
+    Builds every platform of an image target in one BuildKit run.
+
+    The per-arch images are published as a single manifest index under one tag,
+    or written to a local OCI layout at dist/<name>/oci when not pushing.
+    """
+    platforms_label = ",".join(target.platforms)
+    print(f"Building {target.type} {target.name} ({platforms_label}) as multi-arch index...")
+
+    stager = stager or temporary_context
+    with stager(target, pkg_cfg) as (
+        temp_context,
+        has_requirements,
+        layer_requirements_map,
+    ):
+        df_content = df_gen.generate(
+            runtime=target.runtime,
+            requirements=has_requirements,
+            layers=target.layers,
+            layer_requirements=layer_requirements_map,
+            is_image=True,
+            handler=target.handler,
+            installer=target.installer,
+            layer_installers=resolve_layer_installers(target, pkg_cfg),
+            platforms=list(target.platforms),
+        )
+
+        tag = oci_exporter.resolve_index_tag(
+            name=target.name, custom_tag=target.image_tag
+        )
+        layout_dest = dist / target.name / "oci"
+        export_args = oci_exporter.get_index_export_args(
+            tags=[tag], push=push, layout_dest=layout_dest
+        )
+
+        metrics = builder.build(
+            dockerfile_content=df_content,
+            context_path=temp_context,
+            platforms=target.platforms,
+            cache_to=cache,
+            cache_from=cache,
+            **export_args
+        )
+
+        metadata = with_metrics(
+            {"platforms": list(target.platforms), "index": True}, metrics
+        )
+        if push:
+            manifest.add_artifact(target.name, target.type, tag, metadata)
+        else:
+            metadata["tag"] = tag
+            manifest.add_artifact(
+                target.name, target.type, layout_dest.absolute(), metadata
+            )
+
+
+def process_llb_batch(tasks, pkg_cfg, dist, cache, llb_builder, zip_exporter, manifest):
+    """
+    Builds every ZIP task in one LLB solve (see builders.llb), then exports each ZIP.
+
+    Step metrics cover the whole solve, so they go to the manifest summary rather
+    than to individual artifacts.
+    """
+    from .builders.llb import collect_outputs
+
+    print(f"Building {len(tasks)} ZIP tasks as one LLB graph...")
+    with tempfile.TemporaryDirectory() as output_dir:
+        output_dest = Path(output_dir)
+        metrics = llb_builder.build(
+            tasks, pkg_cfg, output_dest, cache_to=cache, cache_from=cache
+        )
+        collect_outputs(tasks, output_dest, dist)
+
+    if metrics:
+        manifest.summary["llb"] = {"tasks": len(tasks), **metrics}
+    for target, platform in tasks:
+        export_zip(target, platform, dist, zip_exporter, manifest)
+
+
+def parse_concurrency(ctx, param, value):
+    """Parses -j as a positive worker count or 'auto' (None when not given)."""
+    if value is None or value == "auto":
+        return value
+    try:
+        workers = int(value)
+    except ValueError:
+        raise click.BadParameter("expected a number or 'auto'")
+    if workers < 1:
+        raise click.BadParameter(f"must be at least 1, got {value}")
+    return workers
+
+
+def parse_shard(ctx, param, value) -> Optional[Tuple[int, int]]:
+    """Parses an 'I/N' shard spec into (index, count)."""
+    if value is None:
+        return None
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise click.BadParameter("expected I/N, e.g. 2/4")
+    if count < 1 or not 1 <= index <= count:
+        raise click.BadParameter(f"shard index must be between 1 and N, got {value}")
+    return index, count
 
 
 @cli.command()
@@ -150,35 +348,234 @@ def process_target_platform(
 @click.option("--cache", type=str, help="BuildKit cache options.")
 @click.option("--push", is_flag=True, help="Push image artifacts to registry.")
 @click.option(
-    "-j", "--concurrency", type=int, default=1, help="Number of parallel builds."
+    "-j",
+    "--concurrency",
+    callback=parse_concurrency,
+    metavar="N|auto",
+    help=(
+        "Number of parallel builds, or 'auto' to size it from CPU, memory and disk "
+        "(default: the builder pool's total concurrency, or 1)."
+    ),
+)
+@click.option(
+    "--daemon",
+    type=click.Path(path_type=Path),
+    help=f"Send the build to a running 'lambda-packer serve' on this socket (e.g. {DEFAULT_SOCKET}).",
 )
-def build(config: Path, dist: Path, cache: Optional[str], push: bool, concurrency: int):
+@click.option(
+    "--shard",
+    callback=parse_shard,
+    metavar="I/N",
+    help="Only build the I-th of N deterministic shards of the task list (1-based).",
+)
+@click.option(
+    "--backend",
+    type=click.Choice(["dockerfile", "llb"]),
+    default="dockerfile",
+    show_default=True,
+    help="'llb' solves all ZIP targets as one BuildKit graph via buildctl.",
+)
+@click.option(
+    "--buildkit-addr",
+    help="buildkitd address for --backend llb (default: $BUILDKIT_HOST).",
+)
+def build(
+    config: Path,
+    dist: Path,
+    cache: Optional[str],
+    push: bool,
+    concurrency,
+    daemon: Optional[Path],
+    shard: Optional[Tuple[int, int]],
+    backend: str,
+    buildkit_addr: Optional[str],
+):
     """Builds AWS Lambda and Layer artifacts defined in the configuration."""
-    pkg_cfg = PackageConfig.from_yaml(config)
-    planner = Planner(pkg_cfg)
-    targets = planner.plan()
+    if daemon:
+        if backend != "dockerfile" or buildkit_addr:
+            # The daemon builds through its own Dockerfile-based pipeline.
+            raise click.UsageError("--backend llb and --buildkit-addr cannot be used with --daemon")
+        from .daemon import request_build
 
-    df_gen = DockerfileGenerator()
-    builder = BuildKitBuilder()
-    zip_exporter = ZipExporter()
-    oci_exporter = OCIExporter()
+        request_build(daemon, config, dist, cache, push, shard)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .builders.dockerfile import DockerfileGenerator
+    from .config import PackageConfig
+    from .lockfile import BaseImageLock
+
+    pkg_cfg = PackageConfig.from_yaml(config)
     manifest = ManifestGenerator(dist)
+    lock = BaseImageLock.find(config)
+    if lock:
+        print(f"Using pinned base images from {lock.path}")
 
-    dist.mkdir(parents=True, exist_ok=True)
+    llb_builder = None
+    if backend == "llb":
+        from .builders.llb import LLBBuilder
+
+        llb_builder = LLBBuilder(addr=buildkit_addr, lock=lock)
+
+    pool = None
+    if pkg_cfg.builders:
+        from .builders.pool import BuilderPool
+
+        pool = BuilderPool(pkg_cfg.builders)
+    if concurrency is None:
+        # Enough workers to keep every builder in the pool busy.
+        concurrency = pool.concurrency if pool else 1
+
+    adaptive = None
+    max_workers = concurrency
+    if concurrency == "auto":
+        from .concurrency import AdaptiveConcurrency
+
+        adaptive = AdaptiveConcurrency()
+        max_workers = adaptive.max_workers
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        run_build(
+            pkg_cfg,
+            dist,
+            cache,
+            push,
+            executor,
+            DockerfileGenerator(lock=lock),
+            BuildKitBuilder(),
+            manifest,
+            concurrency,
+            shard=shard,
+            llb_builder=llb_builder,
+            adaptive=adaptive,
+            pool=pool,
+        )
+
+    # Record all results in the build_manifest.json
+    manifest.save()
+    print("\nBuild complete!")
+
+
+def plan_tasks(targets):
+    """
+    Expands targets into (target, platform) build tasks.
+
+    Multi-arch images are a single task covering all their platforms, marked with
+    a platform of None.
+    """
+    from .config import ArtifactType
 
-    # Gather all tasks (target + platform combinations)
     tasks = []
     for target in targets:
+        if target.artifact_format == ArtifactType.IMAGE and target.multi_arch:
+            tasks.append((target, None))
+            continue
         for platform in target.platforms:
             tasks.append((target, platform))
+    return tasks
+
 
+def run_build(
+    pkg_cfg,
+    dist,
+    cache,
+    push,
+    executor,
+    df_gen,
+    builder,
+    manifest,
+    concurrency,
+    stager=None,
+    shard=None,
+    llb_builder=None,
+    adaptive=None,
+    pool=None,
+):
+    """
+    Plans the configuration and runs every build task on the given executor.
+
+    The executor may be shared with other callers (see `lambda-packer serve`); this
+    call only waits for its own tasks. With `shard` as (index, count), only that
+    shard's tasks are built (see Planner.shard). With an `llb_builder`, all ZIP
+    tasks are built together as one task. With `adaptive` (an AdaptiveConcurrency),
+    staging, BuildKit builds and ZIP exports are each limited by its phase limits.
+    A `pool` shared between calls keeps builder limits global; otherwise one is
+    created from the config's `builders`, if any. Returns the (name, platform,
+    error) of each failed task.
+    """
+    from concurrent.futures import as_completed
+
+    from .config import ArtifactType
+    from .planner import Planner
+
+    stager = stager or temporary_context
+    if pool is None and pkg_cfg.builders:
+        from .builders.pool import BuilderPool
+
+        pool = BuilderPool(pkg_cfg.builders)
+    session = None
+    if pool:
+        # Counts this run's tasks separately from other users of a shared pool.
+        builder = session = pool.session()
+    zip_exporter = ZipExporter()
+    oci_exporter = OCIExporter()
+    if adaptive:
+        history_start = adaptive.mark()
+        stager = adaptive.wrap_stager(stager)
+        builder = adaptive.wrap_builder(builder)
+        zip_exporter = adaptive.wrap_exporter(zip_exporter)
+
+    dist.mkdir(parents=True, exist_ok=True)
+
+    planner = Planner(pkg_cfg)
+    tasks = plan_tasks(planner.plan())
+    if shard:
+        total = len(tasks)
+        tasks = planner.shard(tasks, *shard)
+        manifest.summary["shard"] = {"index": shard[0], "count": shard[1]}
+        print(f"Shard {shard[0]}/{shard[1]}: {len(tasks)} of {total} tasks")
     print(f"Found {len(tasks)} build tasks. Parallelism: {concurrency}")
 
-    # Execute builds in parallel using a ThreadPoolExecutor.
-    # Each task is an independent 'docker buildx' call.
-    with ThreadPoolExecutor(max_workers=concurrency) as executor:
-        futures = {
-            executor.submit(
+    futures = {}
+    if llb_builder:
+        llb_tasks = [
+            (target, platform)
+            for target, platform in tasks
+            if target.artifact_format == ArtifactType.ZIP
+        ]
+        tasks = [task for task in tasks if task not in llb_tasks]
+        if llb_tasks:
+            future = executor.submit(
+                process_llb_batch,
+                llb_tasks,
+                pkg_cfg,
+                dist,
+                cache,
+                llb_builder,
+                zip_exporter,
+                manifest,
+            )
+            futures[future] = ("llb", f"{len(llb_tasks)} ZIP tasks")
+
+    # Each remaining task is an independent 'docker buildx' call.
+    for target, platform in tasks:
+        if platform is None:
+            future = executor.submit(
+                process_multi_arch_image,
+                target,
+                pkg_cfg,
+                dist,
+                cache,
+                push,
+                df_gen,
+                builder,
+                oci_exporter,
+                manifest,
+                stager,
+            )
+        else:
+            future = executor.submit(
                 process_target_platform,
                 target,
                 platform,
@@ -191,19 +588,246 @@ def build(config: Path, dist: Path, cache: Optional[str], push: bool, concurrenc
                 zip_exporter,
                 oci_exporter,
                 manifest,
-            ): (target, platform)
-            for target, platform in tasks
-        }
-        for future in as_completed(futures):
-            target, platform = futures[future]
-            try:
-                future.result()
-            except Exception as e:
-                print(f"Build failed for {target.name} ({platform}): {e}")
+                stager,
+            )
+        futures[future] = (target.name, platform or ",".join(target.platforms))
 
-    # Record all results in the build_manifest.json
+    failures = []
+    for future in as_completed(futures):
+        name, label = futures[future]
+        try:
+            future.result()
+        except Exception as e:
+            print(f"Build failed for {name} ({label}): {e}")
+            failures.append((name, label, e))
+
+    record_run_metrics(manifest)
+    if session:
+        record_builder_utilisation(manifest, session)
+    if adaptive:
+        manifest.summary["concurrency"] = adaptive.report(since=history_start)
+    return failures
+
+
+def record_builder_utilisation(manifest, session):
+    """Adds this run's per-builder task counts and utilisation to the manifest summary."""
+    report = session.report()
+    manifest.summary["builders"] = report
+    print("Builders:")
+    for name, stats in report.items():
+        print(
+            f"  {name}: {stats['tasks']} tasks ({stats['spilled_tasks']} spilled), "
+            f"peak {stats['peak_concurrency']}/{stats['concurrency']}, "
+            f"utilisation {stats['utilisation']:.0%}"
+        )
+
+
+def record_run_metrics(manifest):
+    """Summarises BuildKit step metrics across all artifacts into the manifest."""
+    from .builders.progress import summarize_run
+
+    summaries = []
+    for artifact in manifest.artifacts:
+        metrics = artifact["metadata"].get("buildkit")
+        if metrics:
+            platform = artifact["metadata"].get("platform") or ",".join(
+                artifact["metadata"].get("platforms", [])
+            )
+            summaries.append((f"{artifact['name']} ({platform})", metrics))
+    if not summaries:
+        return
+
+    run = summarize_run(summaries)
+    manifest.summary["buildkit"] = run
+    print(
+        f"BuildKit: {run['cached_steps']}/{run['total_steps']} steps cached "
+        f"({run['cache_hit_ratio']:.0%}), {run['bytes']} bytes transferred"
+    )
+    for step in run["slowest_steps"]:
+        print(f"  {step['duration_s']:>8.1f}s  {step['target']}: {step['name']}")
+
+
+@cli.command()
+@click.option(
+    "--config",
+    type=click.Path(exists=True, path_type=Path),
+    default=Path("package_config.yaml"),
+    help="Path to the package config YAML.",
+)
+def plan(config: Path):
+    """Lists the build tasks defined in the configuration without building them."""
+    from .config import PackageConfig
+    from .planner import Planner
+
+    pkg_cfg = PackageConfig.from_yaml(config)
+    for target, platform in plan_tasks(Planner(pkg_cfg).plan()):
+        label = platform or ",".join(target.platforms)
+        print(f"{target.type}\t{target.name}\t{target.artifact_format.value}\t{label}")
+
+
+@cli.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(path_type=Path),
+    default=DEFAULT_SOCKET,
+    show_default=True,
+    help="Unix socket to listen on.",
+)
+@click.option(
+    "-j",
+    "--concurrency",
+    callback=parse_concurrency,
+    metavar="N|auto",
+    help=(
+        "Number of parallel builds, or 'auto' to size it from CPU, memory and disk "
+        "(default: the largest builder pool's total concurrency, or 1)."
+    ),
+)
+def serve(socket_path: Path, concurrency):
+    """Runs a build daemon that keeps config, hashes and staged contexts warm."""
+    from .daemon import BuildDaemon
+
+    daemon = BuildDaemon(socket_path, concurrency=concurrency)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+@cli.command()
+@click.argument("target")
+@click.option(
+    "--config",
+    type=click.Path(exists=True, path_type=Path),
+    default=Path("package_config.yaml"),
+    help="Path to the package config YAML.",
+)
+@click.option(
+    "--dist",
+    type=click.Path(exists=True, path_type=Path),
+    default=Path("dist"),
+    help="Output directory of a previous build.",
+)
+@click.option(
+    "--platform",
+    default=None,
+    help="Platform of the artifact to profile (default: the host's).",
+)
+@click.option(
+    "--python",
+    "python_exe",
+    default=sys.executable,
+    help="Interpreter to import the handler with; should match the runtime.",
+)
+def profile(
+    target: str, config: Path, dist: Path, platform: Optional[str], python_exe: str
+):
+    """Profiles the cold-start import cost of a built ZIP lambda's handler."""
+    from .config import PackageConfig
+    from .profiler import ImportProfiler
+
+    pkg_cfg = PackageConfig.from_yaml(config)
+    lambda_cfg = pkg_cfg.lambdas.get(target)
+    if lambda_cfg is None or not lambda_cfg.handler:
+        raise click.ClickException(f"Lambda '{target}' with a 'handler' not found in {config}")
+
+    platform = platform or host_platform()
+    arch = platform.split("/")[-1]
+
+    manifest = ManifestGenerator.load(dist)
+    artifact = next(
+        (
+            a
+            for a in manifest.artifacts
+            if a["name"] == target
+            and a["metadata"].get("platform") == platform
+            and a["path"].endswith(".zip")
+        ),
+        None,
+    )
+    if artifact is None:
+        raise click.ClickException(f"No ZIP artifact for {target} ({platform}) in {dist}")
+
+    # Prefer the exported asset tree; fall back to the ZIP itself.
+    source = dist / target / arch / "asset"
+    if not source.is_dir():
+        source = dist / artifact["path"]
+
+    result = ImportProfiler(python_exe).profile(source, lambda_cfg.handler)
+    artifact["metadata"]["import_profile"] = result
     manifest.save()
-    print("\nBuild complete!")
+
+    print(f"Import time for {target} ({platform}): {result['total_ms']:.1f} ms")
+    for package, ms in result["packages"].items():
+        print(f"{ms:>10.1f} ms  {package}")
+
+
+@cli.command("update-base-images")
+@click.option(
+    "--config",
+    type=click.Path(exists=True, path_type=Path),
+    default=Path("package_config.yaml"),
+    help="Path to the package config YAML.",
+)
+def update_base_images(config: Path):
+    """Resolves base image tags to digests and writes lambda-packer.lock."""
+    from .builders.dockerfile import FRONTEND_IMAGE, base_images
+    from .config import ArtifactType, PackageConfig
+    from .lockfile import LOCKFILE_NAME, BaseImageLock
+    from .planner import Planner
+
+    pkg_cfg = PackageConfig.from_yaml(config)
+
+    # Image tag -> every platform it is built for. The frontend needs no platform
+    # manifests: it is pinned by index digest.
+    refs = {FRONTEND_IMAGE: set()}
+    for target in Planner(pkg_cfg).plan():
+        installers = [target.installer] + list(
+            resolve_layer_installers(target, pkg_cfg).values()
+        )
+        is_image = target.artifact_format == ArtifactType.IMAGE
+        for ref in base_images(target.runtime, is_image, installers):
+            refs.setdefault(ref, set()).update(target.platforms)
+
+    lock = BaseImageLock(config.parent / LOCKFILE_NAME)
+    lock.update(refs)
+    for ref, entry in lock.images.items():
+        print(f"{ref} -> {entry['digest']}")
+    lock.save()
+
+
+@cli.command("merge-manifests")
+@click.argument(
+    "manifests", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path)
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(path_type=Path),
+    default=Path("dist"),
+    help="Directory to write the merged build_manifest.json to.",
+)
+def merge_manifests(manifests: Tuple[Path, ...], output: Path):
+    """Combines per-shard build_manifest.json files into one."""
+    merged = ManifestGenerator(output)
+    for path in manifests:
+        shard_dist = path if path.is_dir() else path.parent
+        merged.extend(ManifestGenerator.load(shard_dist))
+
+    record_run_metrics(merged)
+    output.mkdir(parents=True, exist_ok=True)
+    merged.save()
+    print(f"Merged {len(manifests)} manifests ({len(merged.artifacts)} artifacts).")
+
+
+def host_platform() -> str:
+    """Returns the host's platform in Docker notation (e.g. 'linux/arm64')."""
+    import platform
+
+    machine = platform.machine().lower()
+    arch = {"x86_64": "amd64", "aarch64": "arm64"}.get(machine, machine)
+    return f"linux/{arch}"
 
 
 if __name__ == "__main__":
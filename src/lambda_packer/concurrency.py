@@ -0,0 +1,234 @@
+"""Adaptive, phase-aware concurrency for `build -j auto`."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Memory set aside per local task (staging copies, ZIP export buffers whole files).
+LOCAL_TASK_MEMORY = 512 * 1024 * 1024
+
+# Below this much available memory, fewer BuildKit builds are started at once.
+LOW_MEMORY = 1024 * 1024 * 1024
+
+# An extra concurrent export must raise aggregate disk throughput by this much,
+# or the local limit is capped at the previous level.
+DISK_GAIN = 1.1
+
+# Phases that do heavy local work (disk, memory, CPU) and share the local limit.
+LOCAL_PHASES = ("stage", "export")
+
+
+def cpu_count() -> int:
+    """CPUs usable by this process (respects affinity masks, e.g. in containers)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def available_memory() -> Optional[int]:
+    """Bytes of memory available to new work, or None if it cannot be determined."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class AdaptiveConcurrency:
+    """
+    Sizes and adjusts build concurrency at runtime, per task phase.
+
+    A task moves through three phases: staging its context ("stage"), waiting on
+    BuildKit ("build") and exporting the ZIP ("export"). Waiting on BuildKit costs
+    little locally, so many builds may be in flight at once (two per CPU, fewer when
+    memory runs low). Staging and export compete for disk and memory, so they share
+    a smaller local limit: at most one per CPU, bounded by available memory, and
+    capped once adding another concurrent export stops raising disk throughput.
+
+    The executor is sized for both limits combined (`max_workers`), so exports of
+    finished builds overlap with builds still running. Each time the limits change,
+    the new values and the reason are printed and kept in `history`.
+    """
+
+    def __init__(
+        self,
+        cpus: Optional[int] = None,
+        memory: Callable[[], Optional[int]] = available_memory,
+    ):
+        self.cpus = cpus or cpu_count()
+        self._memory = memory
+        self._cond = threading.Condition()
+        self._started = time.monotonic()
+        self._active: Dict[str, int] = {"stage": 0, "build": 0, "export": 0}
+        self._peak: Dict[str, int] = dict(self._active)
+        self._disk_cap: Optional[int] = None
+        # Export concurrency level -> [bytes moved, seconds] of the exports started at it.
+        self._throughput: Dict[int, List[float]] = {}
+        self.history: List[Dict] = []
+        self.build_limit = self.local_limit = 0
+        self._marked = False
+        with self._cond:
+            self._resize("initial")
+
+    @property
+    def max_workers(self) -> int:
+        """Threads needed to fill both limits at their largest."""
+        return self.cpus * 3
+
+    @contextmanager
+    def phase(self, name: str):
+        """Holds a slot for `name` ("stage", "build" or "export") while the block runs."""
+        with self._cond:
+            self._resize("memory")
+            while not self._has_slot(name):
+                self._cond.wait(timeout=1.0)
+                self._resize("memory")
+            self._active[name] += 1
+            self._peak[name] = max(self._peak[name], self._active[name])
+            level = self._active[name]
+        try:
+            yield level
+        finally:
+            with self._cond:
+                self._active[name] -= 1
+                self._cond.notify_all()
+
+    def _has_slot(self, name: str) -> bool:
+        # Caller holds self._cond.
+        if name in LOCAL_PHASES:
+            return sum(self._active[p] for p in LOCAL_PHASES) < self.local_limit
+        return self._active[name] < self.build_limit
+
+    def _resize(self, reason: str) -> None:
+        # Caller holds self._cond.
+        memory = self._memory()
+        build = self.cpus * 2
+        local = self.cpus
+        if memory is not None:
+            if memory < LOW_MEMORY:
+                build = max(1, build // 2)
+            local = min(local, memory // LOCAL_TASK_MEMORY)
+        if self._disk_cap is not None:
+            local = min(local, self._disk_cap)
+        local = max(1, local)
+
+        if (build, local) != (self.build_limit, self.local_limit):
+            self.build_limit, self.local_limit = build, local
+            self._log(reason, memory)
+            self._cond.notify_all()
+
+    def _log(self, reason: str, memory: Optional[int]) -> None:
+        elapsed = round(time.monotonic() - self._started, 1)
+        entry = {"t": elapsed, "build": self.build_limit, "local": self.local_limit, "reason": reason}
+        if memory is not None:
+            entry["memory_mb"] = memory // (1024 * 1024)
+        self.history.append(entry)
+        print(
+            f"[-j auto +{elapsed}s] {self.build_limit} builds, "
+            f"{self.local_limit} local tasks ({reason})"
+        )
+
+    def record_export(self, level: int, written: int, seconds: float) -> None:
+        """Feeds one export's throughput, measured at `level` concurrent exports."""
+        with self._cond:
+            sample = self._throughput.setdefault(level, [0.0, 0.0])
+            sample[0] += written
+            sample[1] += max(seconds, 1e-6)
+            if level < 2 or level - 1 not in self._throughput:
+                return
+            # Aggregate throughput = per-export rate x exports running together.
+            current = self._rate(level) * level
+            previous = self._rate(level - 1) * (level - 1)
+            if current < previous * DISK_GAIN and (self._disk_cap is None or self._disk_cap >= level):
+                self._disk_cap = level - 1
+                self._resize("disk")
+
+    def _rate(self, level: int) -> float:
+        written, seconds = self._throughput[level]
+        return written / seconds
+
+    def mark(self) -> int:
+        """
+        Marks the start of a run, for `report(since=...)`.
+
+        The first run also owns the initial sizing; later runs of a limiter shared
+        between runs (see `lambda-packer serve`) start at the current history.
+        """
+        with self._cond:
+            start = len(self.history) if self._marked else 0
+            self._marked = True
+            return start
+
+    def report(self, since: int = 0) -> Dict:
+        """
+        The limits over time and the peak number of tasks seen in each phase.
+
+        With `since` (from `mark()`), only the changes from then on and the limits
+        in effect are reported, without the lifetime peaks.
+        """
+        with self._cond:
+            report = {
+                "history": self.history[since:],
+                "limits": {"build": self.build_limit, "local": self.local_limit},
+            }
+            if not since:
+                report["peak"] = dict(self._peak)
+            return report
+
+    # Wrappers that put existing components' work under the matching phase.
+
+    def wrap_stager(self, stager):
+        @contextmanager
+        def staged(target, pkg_cfg):
+            # Only entering the stager (copying files) counts as the stage phase.
+            with ExitStack() as stack:
+                with self.phase("stage"):
+                    staged_context = stack.enter_context(stager(target, pkg_cfg))
+                yield staged_context
+
+        return staged
+
+    def wrap_builder(self, builder):
+        return _PhasedBuilder(self, builder)
+
+    def wrap_exporter(self, exporter):
+        return _PhasedExporter(self, exporter)
+
+
+class _PhasedBuilder:
+    """Same `build()` as the wrapped builder, run under the "build" phase."""
+
+    def __init__(self, limiter: AdaptiveConcurrency, builder):
+        self._limiter = limiter
+        self._builder = builder
+
+    def build(self, **kwargs):
+        with self._limiter.phase("build"):
+            return self._builder.build(**kwargs)
+
+
+class _PhasedExporter:
+    """Same `export()` as the wrapped ZipExporter, run under the "export" phase."""
+
+    def __init__(self, limiter: AdaptiveConcurrency, exporter):
+        self._limiter = limiter
+        self._exporter = exporter
+
+    def export(self, src_dir, dest_zip) -> int:
+        with self._limiter.phase("export") as level:
+            started = time.monotonic()
+            read = self._exporter.export(src_dir, dest_zip)
+            elapsed = time.monotonic() - started
+        # Bytes the exporter read from the tree plus bytes written to the ZIP.
+        self._limiter.record_export(level, read + os.path.getsize(dest_zip), elapsed)
+        return read
@@ -6,8 +6,7 @@ from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
-import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class ArtifactType(str, Enum):
@@ -17,6 +16,13 @@ class ArtifactType(str, Enum):
     IMAGE = "image"
 
 
+class Installer(str, Enum):
+    """Supported backends for installing requirements inside the build."""
+
+    PIP = "pip"
+    UV = "uv"
+
+
 class LayerConfig(BaseModel):
     """Configuration for an AWS Lambda Layer."""
 
@@ -32,6 +38,19 @@ class LayerConfig(BaseModel):
     platforms: List[str] = Field(default_factory=lambda: ["linux/amd64"])
     """Target architectures for the layer."""
 
+    installer: Optional[Installer] = None
+    """Backend used to install requirements. Defaults to PackageConfig.installer_default."""
+
+
+class PruneConfig(BaseModel):
+    """Options for removing modules that are unreachable from the handler (ZIP only)."""
+
+    keep: List[str] = Field(default_factory=list)
+    """Modules to keep although no static import reaches them (names, prefixes or globs)."""
+
+    verify: bool = True
+    """Re-import the handler after pruning and revert if it fails."""
+
 
 class LambdaConfig(BaseModel):
     """Configuration for an AWS Lambda Function."""
@@ -54,12 +73,56 @@ class LambdaConfig(BaseModel):
     platforms: List[str] = Field(default_factory=lambda: ["linux/amd64"])
     """Target architectures for the Lambda."""
 
+    installer: Optional[Installer] = None
+    """Backend used to install requirements. Defaults to PackageConfig.installer_default."""
+
     image_tag: Optional[str] = None
     """Custom OCI tag for 'image' type. Supports {arch} and {name} placeholders."""
 
     handler: Optional[str] = None
     """The Lambda handler entry point (e.g., 'lambda_function.handler'). Required for 'image' type."""
 
+    multi_arch: bool = False
+    """For 'image' type, publish one multi-arch manifest index under a single tag instead of a tag per arch."""
+
+    prune: Optional[PruneConfig] = None
+    """For 'zip' type, drop modules unreachable from the handler. `prune: true` enables it with defaults."""
+
+    @field_validator("prune", mode="before")
+    @classmethod
+    def _prune_flag(cls, value):
+        if value is True:
+            return {}
+        if value is False:
+            return None
+        return value
+
+    @model_validator(mode="after")
+    def _check_prune(self) -> LambdaConfig:
+        if self.prune is None:
+            return self
+        if self.type != ArtifactType.ZIP:
+            raise ValueError("prune is only supported for 'zip' type lambdas")
+        if not self.handler:
+            raise ValueError("prune requires a handler to trace imports from")
+        return self
+
+
+class BuilderConfig(BaseModel):
+    """A buildx builder in the build pool (see `docker buildx ls`)."""
+
+    name: str
+    """Name of the buildx builder instance."""
+
+    platforms: List[str] = Field(default_factory=lambda: ["linux/amd64"])
+    """Platforms this builder runs natively, e.g. [linux/arm64] for an arm64 node."""
+
+    concurrency: int = Field(default=1, ge=1)
+    """Maximum number of builds sent to this builder at once."""
+
+    emulate: bool = True
+    """Accept tasks for other platforms (via emulation) when their native builders are saturated."""
+
 
 class PackageConfig(BaseModel):
     """Root configuration object for a lambda-packer project."""
@@ -67,15 +130,57 @@ class PackageConfig(BaseModel):
     runtime_default: str = "python3.12"
     """Global default Python runtime."""
 
+    installer_default: Installer = Installer.PIP
+    """Global default backend for installing requirements ('pip' or 'uv')."""
+
     layers: Dict[str, LayerConfig] = Field(default_factory=dict)
     """Map of layer names to their configurations."""
 
     lambdas: Dict[str, LambdaConfig] = Field(default_factory=dict)
     """Map of lambda names to their configurations."""
 
+    builders: List[BuilderConfig] = Field(default_factory=list)
+    """Pool of buildx builders to route tasks to by platform. Empty uses the default builder."""
+
     @classmethod
     def from_yaml(cls, path: Union[str, Path]) -> PackageConfig:
         """Loads and validates a PackageConfig from a YAML file."""
+        import yaml
+
         with open(path, "r") as f:
             data = yaml.safe_load(f)
         return cls.model_validate(data)
+
+    def resolve_paths(self, base: Union[str, Path]) -> PackageConfig:
+        """
+        Returns a copy with every relative path made absolute against `base`.
+
+        Paths in the YAML are relative to the caller's working directory, which a
+        long-running process (e.g. `lambda-packer serve`) does not share.
+        """
+        base = Path(base)
+
+        def absolute(path: Optional[Path]) -> Optional[Path]:
+            if path is None or path.is_absolute():
+                return path
+            return base / path
+
+        layers = {
+            name: layer.model_copy(
+                update={
+                    "path": absolute(layer.path),
+                    "requirements": absolute(layer.requirements),
+                }
+            )
+            for name, layer in self.layers.items()
+        }
+        lambdas = {
+            name: fn.model_copy(
+                update={
+                    "path": absolute(fn.path),
+                    "requirements": absolute(fn.requirements),
+                }
+            )
+            for name, fn in self.lambdas.items()
+        }
+        return self.model_copy(update={"layers": layers, "lambdas": lambdas})
@@ -0,0 +1,346 @@
+"""Long-running build daemon that keeps configuration and staging state warm."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import socket
+import socketserver
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import click
+
+from .builders.buildkit import BuildKitBuilder
+from .builders.pool import BuilderPool
+from .manifest import ManifestGenerator
+
+
+class FileHashCache:
+    """
+    In-memory SHA-256 digests of source files.
+
+    A file is only re-read when its mtime or size changes, so fingerprinting an
+    unchanged tree costs one stat per file.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Path, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def file_digest(self, path: Path) -> str:
+        st = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+
+        with self._lock:
+            self._entries[path] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+    def tree_digest(self, root: Path) -> str:
+        """Digest of a file, or of every file under a directory (names and contents)."""
+        root = Path(root)
+        if root.is_file():
+            return self.file_digest(root)
+
+        h = hashlib.sha256()
+        for current, dirs, files in os.walk(root):
+            dirs.sort()
+            for file in sorted(files):
+                file_path = Path(current) / file
+                h.update(str(file_path.relative_to(root)).encode())
+                h.update(self.file_digest(file_path).encode())
+        return h.hexdigest()
+
+
+class ConfigCache:
+    """Parsed PackageConfigs, reloaded only when the YAML file changes."""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[Path, Path], Tuple[int, object]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, path: Path, base: Path):
+        from .config import PackageConfig
+
+        key = (Path(path).absolute(), Path(base))
+        mtime = os.stat(key[0]).st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == mtime:
+                return entry[1]
+
+        pkg_cfg = PackageConfig.from_yaml(key[0]).resolve_paths(base)
+        with self._lock:
+            self._entries[key] = (mtime, pkg_cfg)
+        return pkg_cfg
+
+
+class StagedContextCache:
+    """
+    Keeps staged build contexts on disk between requests.
+
+    Contexts are keyed by a fingerprint of everything copied into them, so a target
+    is only restaged when its source, requirements or layers change. All platforms
+    of a target share one context. Superseded contexts are removed once no build
+    is using them.
+    """
+
+    def __init__(self, root: Path, hashes: FileHashCache):
+        self.root = root
+        self.hashes = hashes
+        self._ready: Dict[Path, Tuple[bool, Dict[str, bool]]] = {}
+        self._dir_locks: Dict[Path, threading.Lock] = {}
+        self._refcounts: Dict[Path, int] = {}
+        self._latest: Dict[str, Path] = {}
+        self._owners: Dict[Path, str] = {}
+        self._lock = threading.Lock()
+
+    def fingerprint(self, target, pkg_cfg) -> str:
+        h = hashlib.sha256()
+        h.update(self.hashes.tree_digest(target.path).encode())
+        if target.requirements:
+            h.update(b"requirements:" + self.hashes.file_digest(target.requirements).encode())
+        for layer_name in target.layers:
+            layer_cfg = pkg_cfg.layers[layer_name]
+            h.update(f"layer:{layer_name}:".encode())
+            h.update(self.hashes.tree_digest(layer_cfg.path).encode())
+            if layer_cfg.requirements:
+                h.update(self.hashes.file_digest(layer_cfg.requirements).encode())
+        return h.hexdigest()
+
+    @contextmanager
+    def stage(self, target, pkg_cfg):
+        """Drop-in replacement for `cli.temporary_context` that reuses staged contexts."""
+        from .cli import stage_context
+
+        context = self.root / f"{target.name}-{self.fingerprint(target, pkg_cfg)[:16]}"
+
+        with self._lock:
+            dir_lock = self._dir_locks.setdefault(context, threading.Lock())
+            self._refcounts[context] = self._refcounts.get(context, 0) + 1
+            self._latest[target.name] = context
+            self._owners[context] = target.name
+
+        try:
+            with dir_lock:
+                if context not in self._ready:
+                    if context.exists():
+                        shutil.rmtree(context)
+                    context.mkdir(parents=True)
+                    self._ready[context] = stage_context(target, pkg_cfg, context)
+            has_requirements, layer_requirements_map = self._ready[context]
+            yield context, has_requirements, layer_requirements_map
+        finally:
+            with self._lock:
+                self._refcounts[context] -= 1
+                self._prune(target.name)
+
+    def _prune(self, name: str) -> None:
+        # Caller holds self._lock.
+        latest = self._latest.get(name)
+        for context, refs in list(self._refcounts.items()):
+            if refs or context == latest or self._owners.get(context) != name:
+                continue
+            shutil.rmtree(context, ignore_errors=True)
+            del self._refcounts[context]
+            del self._owners[context]
+            self._ready.pop(context, None)
+            self._dir_locks.pop(context, None)
+
+
+class BuildDaemon:
+    """
+    Serves build requests over a Unix socket, sharing warm state between them.
+
+    Every request's tasks are submitted to one worker pool, so concurrent requests
+    queue behind each other instead of oversubscribing BuildKit.
+
+    `concurrency` is a worker count, 'auto' (one AdaptiveConcurrency shared by all
+    requests) or None. With None, the worker pool grows to the total concurrency
+    of the largest builder pool seen so far, and is 1 without builders.
+    """
+
+    def __init__(self, socket_path: Path, concurrency: Union[int, str, None] = None):
+        self.socket_path = Path(socket_path)
+        self.concurrency = concurrency
+        self.adaptive = None
+        if concurrency == "auto":
+            from .concurrency import AdaptiveConcurrency
+
+            self.adaptive = AdaptiveConcurrency()
+            self.workers = self.adaptive.max_workers
+        else:
+            self.workers = concurrency or 1
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        # Executors replaced by a larger one. A request that already picked one up
+        # may still submit to it, so they are only shut down in close().
+        self._retired: List[ThreadPoolExecutor] = []
+        self.state_dir = Path(tempfile.mkdtemp(prefix="lambda-packer-"))
+        self.hashes = FileHashCache()
+        self.configs = ConfigCache()
+        self.contexts = StagedContextCache(self.state_dir / "contexts", self.hashes)
+        self.builder = BuildKitBuilder()
+        # One BuilderPool per distinct `builders` config, shared by all requests so
+        # that each builder's concurrency limit holds across them.
+        self._pools: Dict[str, BuilderPool] = {}
+        self._pools_lock = threading.Lock()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+
+    def _pool(self, builders) -> Optional[BuilderPool]:
+        if not builders:
+            return None
+        key = json.dumps([b.model_dump() for b in builders], sort_keys=True)
+        with self._pools_lock:
+            if key not in self._pools:
+                self._pools[key] = BuilderPool(builders)
+            pool = self._pools[key]
+            if self.concurrency is None and pool.concurrency > self.workers:
+                # Enough workers to keep every builder in the pool busy.
+                self._retired.append(self.executor)
+                self.workers = pool.concurrency
+                self.executor = ThreadPoolExecutor(max_workers=self.workers)
+                print(f"Workers: {self.workers} (builder pool concurrency)")
+            return pool
+
+    def handle(self, request: dict) -> dict:
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True}
+        if command == "build":
+            return self._build(request)
+        return {"ok": False, "error": f"Unknown command: {command}"}
+
+    def _build(self, request: dict) -> dict:
+        from .builders.dockerfile import DockerfileGenerator
+        from .cli import run_build
+        from .lockfile import BaseImageLock
+
+        config = Path(request["config"])
+        pkg_cfg = self.configs.load(config, Path(request["cwd"]))
+        # The lockfile is re-read per request; the compiled template is shared.
+        df_gen = DockerfileGenerator(lock=BaseImageLock.find(config))
+        dist = Path(request["dist"])
+        manifest = ManifestGenerator(dist)
+        # Resolved first: it may grow the executor this request is submitted to.
+        pool = self._pool(pkg_cfg.builders)
+
+        failures = run_build(
+            pkg_cfg,
+            dist,
+            request.get("cache"),
+            request.get("push", False),
+            self.executor,
+            df_gen,
+            self.builder,
+            manifest,
+            self.concurrency if self.adaptive else self.workers,
+            stager=self.contexts.stage,
+            shard=tuple(request["shard"]) if request.get("shard") else None,
+            adaptive=self.adaptive,
+            pool=pool,
+        )
+        manifest.save()
+
+        return {
+            "ok": not failures,
+            "artifacts": manifest.artifacts,
+            "failures": [
+                {"name": name, "platform": label, "error": str(error)}
+                for name, label, error in failures
+            ],
+        }
+
+    def serve_forever(self) -> None:
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    response = daemon.handle(json.loads(line))
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        self._server.daemon_threads = True
+        print(f"Serving on {self.socket_path} (workers: {self.concurrency or self.workers})")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self.close()
+
+    def shutdown(self) -> None:
+        if self._server:
+            self._server.shutdown()
+
+    def close(self) -> None:
+        for executor in self._retired + [self.executor]:
+            executor.shutdown(wait=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+
+
+def send_request(socket_path: Path, payload: dict) -> dict:
+    """Sends one JSON request to a running daemon and returns its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise click.ClickException(f"No response from daemon at {socket_path}")
+    return json.loads(line)
+
+
+def request_build(
+    socket_path: Path,
+    config: Path,
+    dist: Path,
+    cache: Optional[str],
+    push: bool,
+    shard: Optional[Tuple[int, int]] = None,
+) -> None:
+    """Runs a build on the daemon and reports the outcome like a local build."""
+    response = send_request(
+        socket_path,
+        {
+            "command": "build",
+            "config": str(Path(config).absolute()),
+            "dist": str(Path(dist).absolute()),
+            "cwd": os.getcwd(),
+            "cache": cache,
+            "push": push,
+            "shard": list(shard) if shard else None,
+        },
+    )
+    if "error" in response:
+        raise click.ClickException(response["error"])
+
+    for artifact in response["artifacts"]:
+        print(f"Built {artifact['type']} {artifact['name']}: {artifact['path']}")
+    for failure in response["failures"]:
+        print(f"Build failed for {failure['name']} ({failure['platform']}): {failure['error']}")
+    print("\nBuild complete!")
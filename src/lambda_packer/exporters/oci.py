@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import List, Optional
 
 
@@ -12,6 +13,9 @@ class OCIExporter:
     This ensures consistency across different architectures and registries.
     """
 
+    # Value substituted for {arch} when a single tag covers every platform.
+    INDEX_ARCH = "latest"
+
     def __init__(self, default_registry: str = "lambda-packer"):
         self.default_registry = default_registry
 
@@ -42,3 +46,38 @@ class OCIExporter:
             "tags": tags,
             "push": push,
         }
+
+    def resolve_index_tag(self, name: str, custom_tag: Optional[str] = None) -> str:
+        """
+        Resolves the single tag under which a multi-arch manifest index is published.
+
+        The {arch} placeholder expands to 'latest', so a per-arch template such as
+        'registry/{name}:{arch}' keeps working for multi-arch targets.
+        """
+        return self.resolve_tag(name=name, arch=self.INDEX_ARCH, custom_tag=custom_tag)
+
+    def get_index_export_args(
+        self,
+        tags: List[str],
+        push: bool = False,
+        layout_dest: Optional[Path] = None,
+    ) -> dict:
+        """
+        Returns BuildKit export arguments for a multi-platform build.
+
+        When pushing, BuildKit assembles the manifest index itself and uploads every
+        blob once, skipping layers shared between architectures or already present
+        in the registry. Otherwise the per-arch images are written to a local OCI
+        image layout, since a multi-platform result cannot be loaded into Docker.
+        """
+        if push:
+            return self.get_export_args(tags=tags, push=True)
+
+        if not layout_dest:
+            raise ValueError("layout_dest is required when not pushing a multi-arch image")
+
+        return {
+            "output_type": "oci",
+            "output_dest": layout_dest,
+            "tags": tags,
+        }
@@ -20,7 +20,7 @@ class ZipExporter:
     ):  # Default: 1980-01-01 00:00:00
         self.deterministic_timestamp = deterministic_timestamp
 
-    def export(self, src_dir: Path, dest_zip: Path) -> None:
+    def export(self, src_dir: Path, dest_zip: Path) -> int:
         """
         Compresses a directory into a reproducible ZIP file.
         
@@ -28,8 +28,11 @@ class ZipExporter:
         1. Sorts files alphabetically.
         2. Sets a fixed timestamp (1980-01-01) for all entries.
         3. Preserves Unix file permissions (important for executables).
+
+        Returns the total uncompressed size of the files added, in bytes.
         """
         dest_zip.parent.mkdir(parents=True, exist_ok=True)
+        total = 0
 
         with zipfile.ZipFile(dest_zip, "w", zipfile.ZIP_DEFLATED) as zf:
             # os.walk is not guaranteed to be sorted, so we sort explicitly.
@@ -52,6 +55,9 @@ class ZipExporter:
                     zinfo.compress_type = zipfile.ZIP_DEFLATED
 
                     with open(file_path, "rb") as f:
-                        zf.writestr(zinfo, f.read())
+                        data = f.read()
+                    zf.writestr(zinfo, data)
+                    total += len(data)
 
         print(f"Exported ZIP: {dest_zip}")
+        return total
@@ -0,0 +1,128 @@
+"""Lockfile pinning base images to registry digests."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import subprocess
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+LOCKFILE_NAME = "lambda-packer.lock"
+
+
+def _platform_of(manifest: Dict) -> Optional[str]:
+    platform = manifest.get("platform") or {}
+    if not platform.get("os") or not platform.get("architecture"):
+        return None
+    name = f"{platform['os']}/{platform['architecture']}"
+    if platform.get("variant"):
+        name += f"/{platform['variant']}"
+    return name
+
+
+def resolve_image(
+    ref: str,
+    platforms: Iterable[str],
+    inspect: Optional[Callable[[str], bytes]] = None,
+) -> Dict:
+    """
+    Resolves a tag to its manifest index digest and per-platform manifest digests.
+
+    Uses `docker buildx imagetools inspect --raw`, which fetches only the manifest
+    from the registry. Images without an index map every platform to the single
+    manifest's digest.
+    """
+    raw = (inspect or _inspect_raw)(ref)
+    digest = f"sha256:{hashlib.sha256(raw).hexdigest()}"
+    document = json.loads(raw)
+
+    wanted = list(platforms)
+    if "manifests" not in document:
+        return {"digest": digest, "platforms": {p: digest for p in wanted}}
+
+    available = [
+        (_platform_of(m), m["digest"]) for m in document["manifests"] if _platform_of(m)
+    ]
+    by_platform = {}
+    for wanted_platform in wanted:
+        # Prefer an exact match; 'linux/arm64' also matches 'linux/arm64/v8'.
+        exact = [d for p, d in available if p == wanted_platform]
+        loose = [d for p, d in available if p.startswith(wanted_platform + "/")]
+        if exact or loose:
+            by_platform[wanted_platform] = (exact or loose)[0]
+
+    missing = [p for p in wanted if p not in by_platform]
+    if missing:
+        raise ValueError(f"{ref} has no manifest for {', '.join(missing)}")
+    return {"digest": digest, "platforms": by_platform}
+
+
+def _inspect_raw(ref: str) -> bytes:
+    result = subprocess.run(
+        ["docker", "buildx", "imagetools", "inspect", "--raw", ref],
+        check=True,
+        capture_output=True,
+    )
+    return result.stdout
+
+
+class BaseImageLock:
+    """
+    Maps base image tags to pinned digests, per platform.
+
+    Single-platform builds use the platform's manifest digest; multi-platform
+    builds use the index digest so one FROM line serves every platform.
+    """
+
+    def __init__(self, path: Path, images: Optional[Dict[str, Dict]] = None):
+        self.path = Path(path)
+        self.images: Dict[str, Dict] = images or {}
+        self._warned: set = set()
+
+    @classmethod
+    def load(cls, path: Path) -> BaseImageLock:
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(path, data.get("images", {}))
+
+    @classmethod
+    def find(cls, config_path: Path) -> Optional[BaseImageLock]:
+        """Loads the lockfile next to a package config, if there is one."""
+        path = Path(config_path).parent / LOCKFILE_NAME
+        return cls.load(path) if path.exists() else None
+
+    def save(self) -> None:
+        with open(self.path, "w") as f:
+            json.dump({"version": 1, "images": self.images}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Lockfile saved to: {self.path}")
+
+    def update(self, refs: Dict[str, List[str]], inspect=None) -> None:
+        """Re-resolves every image in `refs` (image tag -> platforms) and drops the rest."""
+        self.images = {
+            ref: resolve_image(ref, sorted(platforms), inspect=inspect)
+            for ref, platforms in sorted(refs.items())
+        }
+
+    def pin(self, ref: str, platforms: List[str]) -> str:
+        """
+        Returns `ref@digest` for the given build platforms, or `ref` if it is not locked.
+
+        With no platforms (images that run on the build host, such as the Dockerfile
+        frontend), the index digest is used.
+        """
+        entry = self.images.get(ref)
+        if entry and all(p in entry["platforms"] for p in platforms):
+            if len(platforms) == 1:
+                return f"{ref}@{entry['platforms'][platforms[0]]}"
+            return f"{ref}@{entry['digest']}"
+
+        key = (ref, tuple(platforms))
+        if key not in self._warned:
+            self._warned.add(key)
+            print(
+                f"Warning: {ref} ({','.join(platforms) or 'any platform'}) is not in {self.path.name}; "
+                "run 'lambda-packer update-base-images'."
+            )
+        return ref
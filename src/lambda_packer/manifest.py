@@ -12,8 +12,19 @@ class ManifestGenerator:
     def __init__(self, dist_path: Path):
         self.dist_path = dist_path
         self.artifacts: List[Dict] = []
+        self.summary: Dict = {}
         self._lock = threading.Lock()
 
+    @classmethod
+    def load(cls, dist_path: Path) -> ManifestGenerator:
+        """Reads an existing build_manifest.json so it can be amended and saved again."""
+        manifest = cls(dist_path)
+        with open(dist_path / "build_manifest.json", "r") as f:
+            data = json.load(f)
+        manifest.artifacts = data["artifacts"]
+        manifest.summary = data.get("summary", {})
+        return manifest
+
     def add_artifact(
         self,
         name: str,
@@ -39,8 +50,36 @@ class ManifestGenerator:
                 }
             )
 
+    def extend(self, other: ManifestGenerator) -> None:
+        """
+        Adds another manifest's artifacts, e.g. when merging shard manifests.
+
+        Artifact paths stay relative to their own dist directory, so shard outputs
+        are expected to be collected into a single dist tree. An artifact for the
+        same name, type and platform as an existing one replaces it.
+        """
+        with self._lock:
+            index = {_artifact_key(a): i for i, a in enumerate(self.artifacts)}
+            for artifact in other.artifacts:
+                key = _artifact_key(artifact)
+                if key in index:
+                    print(f"Warning: duplicate artifact {key[0]} ({key[2]}), keeping the last one.")
+                    self.artifacts[index[key]] = artifact
+                else:
+                    index[key] = len(self.artifacts)
+                    self.artifacts.append(artifact)
+
     def save(self) -> None:
         manifest_path = self.dist_path / "build_manifest.json"
         with open(manifest_path, "w") as f:
-            json.dump({"artifacts": self.artifacts}, f, indent=2)
+            data = {"artifacts": self.artifacts}
+            if self.summary:
+                data["summary"] = self.summary
+            json.dump(data, f, indent=2)
         print(f"Manifest saved to: {manifest_path}")
+
+
+def _artifact_key(artifact: Dict) -> tuple:
+    metadata = artifact.get("metadata", {})
+    platform = metadata.get("platform") or ",".join(metadata.get("platforms", []))
+    return (artifact["name"], artifact["type"], platform)
@@ -4,9 +4,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
-from .config import ArtifactType, PackageConfig
+from .config import ArtifactType, Installer, PackageConfig, PruneConfig
 
 
 @dataclass(frozen=True)
@@ -27,6 +27,9 @@ class BuildTarget:
     image_tag: Optional[str] = None
     handler: Optional[str] = None
     digest: Optional[str] = None
+    multi_arch: bool = False
+    installer: Installer = Installer.PIP
+    prune: Optional[PruneConfig] = None
 
 
 class Planner:
@@ -54,6 +57,7 @@ class Planner:
                     runtime=layer_config.runtime or self.config.runtime_default,
                     platforms=layer_config.platforms,
                     requirements=layer_config.requirements,
+                    installer=layer_config.installer or self.config.installer_default,
                 )
             )
 
@@ -71,6 +75,9 @@ class Planner:
                     layers=lambda_config.layers,
                     image_tag=lambda_config.image_tag,
                     handler=lambda_config.handler,
+                    multi_arch=lambda_config.multi_arch,
+                    installer=lambda_config.installer or self.config.installer_default,
+                    prune=lambda_config.prune,
                 )
             )
 
@@ -82,3 +89,60 @@ class Planner:
         for name, lambda_cfg in self.config.lambdas.items():
             graph[name] = set(lambda_cfg.layers)
         return graph
+
+    def shard(
+        self, tasks: List[Tuple[BuildTarget, Optional[str]]], index: int, count: int
+    ) -> List[Tuple[BuildTarget, Optional[str]]]:
+        """
+        Returns the tasks assigned to shard `index` (1-based) of `count`.
+
+        Layers are inlined into each lambda's build, so tasks have no ordering
+        dependencies and are balanced individually: largest estimated cost first,
+        each to the least loaded shard. A layer task goes wherever there is room,
+        independent of its consumers. The result is deterministic for a given
+        config on every node.
+        """
+        if not 1 <= index <= count:
+            raise ValueError(f"Shard index must be between 1 and {count}, got {index}")
+
+        def task_key(i: int) -> Tuple[float, str, str]:
+            target, platform = tasks[i]
+            return (-self.estimate_cost(target, platform), target.name, platform or "")
+
+        loads = [0.0] * count
+        assigned: List[List[int]] = [[] for _ in range(count)]
+        for i in sorted(range(len(tasks)), key=task_key):
+            shard = min(range(count), key=lambda n: (loads[n], n))
+            loads[shard] += self.estimate_cost(*tasks[i])
+            assigned[shard].append(i)
+
+        return [tasks[i] for i in sorted(assigned[index - 1])]
+
+    def estimate_cost(self, target: BuildTarget, platform: Optional[str]) -> float:
+        """
+        Rough relative cost of building a task.
+
+        Counts one unit per task and one per requirement (including those of
+        inlined layers). Multi-arch tasks cost once per platform. Source trees are
+        deliberately not measured: untracked files (__pycache__, .venv, dist/)
+        differ between checkouts and would make nodes disagree on the split.
+        """
+        requirements = [target.requirements]
+        for layer_name in target.layers:
+            layer_cfg = self.config.layers.get(layer_name)
+            if layer_cfg:
+                requirements.append(layer_cfg.requirements)
+
+        cost = 1.0
+        cost += sum(_count_requirements(path) for path in requirements if path)
+        return cost * (1 if platform else len(target.platforms))
+
+
+def _count_requirements(path: Path) -> int:
+    try:
+        with open(path, "r") as f:
+            return sum(
+                1 for line in f if line.strip() and not line.lstrip().startswith("#")
+            )
+    except OSError:
+        return 0
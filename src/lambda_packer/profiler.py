@@ -0,0 +1,87 @@
+"""Cold-start import profiling for built Lambda artifacts."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import tempfile
+import zipfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict
+
+# Written to stderr right before the handler import, so that interpreter startup
+# imports (encodings, site, ...) are excluded from the profile.
+START_MARKER = "lambda-packer:profile-start"
+
+
+def parse_importtime(stderr: str) -> Dict:
+    """
+    Aggregates `-X importtime` output per top-level package.
+
+    Self times are summed, so nested imports are never counted twice. Returns the
+    total and a per-package breakdown in milliseconds, slowest first.
+    """
+    lines = stderr.splitlines()
+    if START_MARKER in lines:
+        lines = lines[lines.index(START_MARKER) + 1 :]
+
+    packages: Dict[str, int] = defaultdict(int)
+    for line in lines:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        packages[name.strip().split(".")[0]] += int(self_us)
+
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "total_ms": round(sum(packages.values()) / 1000, 2),
+        "packages": {name: round(us / 1000, 2) for name, us in ranked},
+    }
+
+
+class ImportProfiler:
+    """
+    Measures what importing a Lambda handler costs, per top-level package.
+
+    The handler module is imported in a separate, isolated interpreter (`-I -S`),
+    with only the artifact root and the standard library on sys.path. The
+    interpreter should match the target's runtime and architecture, or compiled
+    dependencies will fail to load.
+    """
+
+    def __init__(self, python: str = sys.executable):
+        self.python = python
+
+    def profile(self, artifact: Path, handler: str) -> Dict:
+        """
+        Profiles `handler` (e.g. 'app.handler') from an asset tree or a ZIP file.
+        """
+        module = handler.rsplit(".", 1)[0]
+        if artifact.is_dir():
+            return self._profile_tree(artifact, module)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with zipfile.ZipFile(artifact) as zf:
+                zf.extractall(tmp)
+            return self._profile_tree(Path(tmp), module)
+
+    def _profile_tree(self, root: Path, module: str) -> Dict:
+        code = (
+            "import sys; "
+            f"sys.path.insert(0, {str(root.absolute())!r}); "
+            f"sys.stderr.write({START_MARKER!r} + '\\n'); "
+            f"import {module}"
+        )
+        result = subprocess.run(
+            # -S: no site-packages, so dependencies missing from the artifact
+            # fail instead of loading from the host install. -B: never write
+            # bytecode into the artifact (Lambda cannot either).
+            [self.python, "-I", "-S", "-B", "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+            raise RuntimeError(f"Importing '{module}' failed: {error[0]}")
+        return parse_importtime(result.stderr)
@@ -0,0 +1,245 @@
+"""Reachability-based pruning of unused modules from exported Lambda assets."""
+
+from __future__ import annotations
+
+import ast
+import fnmatch
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .profiler import ImportProfiler
+
+_EXTENSION_SUFFIXES = (".so", ".pyd")
+_METADATA_SUFFIXES = (".dist-info", ".egg-info")
+
+
+class ReachabilityPruner:
+    """
+    Removes modules and package data that cannot be reached from the handler.
+
+    Starting at the handler module, imports are followed statically through every
+    `import`, `from ... import` and literal `importlib.import_module()` /
+    `__import__()` call. Modules named in `keep` (exact names, prefixes of
+    submodules, or glob patterns) are treated as reachable, for code loaded
+    dynamically. Conservative rules keep the result importable:
+
+    - Compiled extensions cannot be analysed, so reaching one keeps its whole package.
+    - Data files belong to their nearest regular package and share its fate.
+    - Files at the asset root, data outside any regular package and package
+      metadata (*.dist-info) are always kept.
+
+    Removed files are set aside until a verification run has re-imported the
+    handler in an isolated interpreter; if that fails, they are restored.
+    """
+
+    def __init__(
+        self,
+        keep: Optional[Iterable[str]] = None,
+        verify: bool = True,
+        python: str = sys.executable,
+    ):
+        self.keep = list(keep or [])
+        self.verify = verify
+        self.python = python
+
+    def prune(self, root: Path, handler: str) -> Dict:
+        """Prunes `root` in place and returns a report of what was removed."""
+        entry = handler.rsplit(".", 1)[0]
+        modules = self._index_modules(root)
+        reachable = self._reachable(root, modules, entry)
+
+        removed: List[Path] = []
+        for current, dirs, files in os.walk(root):
+            rel_dir = Path(current).relative_to(root)
+            dirs[:] = [d for d in dirs if not d.endswith(_METADATA_SUFFIXES)]
+            for file in files:
+                rel = rel_dir / file
+                owner = self._owner(root, rel)
+                if owner is not None and owner not in reachable:
+                    removed.append(rel)
+
+        removed_bytes = sum((root / rel).stat().st_size for rel in removed)
+        report = {
+            "removed_files": len(removed),
+            "removed_bytes": removed_bytes,
+            "reachable_modules": len(reachable & set(modules)),
+            "verified": False,
+        }
+        if not removed:
+            return report
+
+        with tempfile.TemporaryDirectory() as backup_dir:
+            backup = Path(backup_dir)
+            for rel in removed:
+                (backup / rel).parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(root / rel), str(backup / rel))
+            # Empty directories would still import as namespace packages.
+            _remove_empty_dirs(root)
+
+            if self.verify and not self._verify(root, handler):
+                for rel in removed:
+                    (root / rel).parent.mkdir(parents=True, exist_ok=True)
+                    shutil.move(str(backup / rel), str(root / rel))
+                print(f"Warning: handler failed to import after pruning {root}; changes reverted.")
+                return {**report, "removed_files": 0, "removed_bytes": 0}
+
+        report["verified"] = self.verify
+        return report
+
+    def _verify(self, root: Path, handler: str) -> bool:
+        # The profiler runs without host site-packages, so a pruned dependency
+        # cannot be satisfied by a host install.
+        try:
+            ImportProfiler(self.python).profile(root, handler)
+        except RuntimeError as e:
+            print(f"Verification failed: {e}")
+            return False
+        return True
+
+    def _index_modules(self, root: Path) -> Dict[str, Path]:
+        """Maps every importable module name in the tree to its source file (or dir)."""
+        modules: Dict[str, Path] = {}
+        for current, dirs, files in os.walk(root):
+            rel_dir = Path(current).relative_to(root)
+            dirs[:] = [
+                d
+                for d in dirs
+                if d.isidentifier() and not d.endswith(_METADATA_SUFFIXES)
+            ]
+            package = ".".join(rel_dir.parts)
+            if package:
+                modules.setdefault(package, Path(current))
+            for file in files:
+                name = _module_name(file)
+                if name is None:
+                    continue
+                if name == "__init__":
+                    modules[package] = Path(current) / file
+                else:
+                    modules[f"{package}.{name}" if package else name] = Path(current) / file
+        return modules
+
+    def _reachable(self, root: Path, modules: Dict[str, Path], entry: str) -> Set[str]:
+        queue = [entry] + [name for name in modules if self._is_kept(name)]
+        reachable: Set[str] = set()
+
+        while queue:
+            name = queue.pop()
+            if name in reachable:
+                continue
+            reachable.add(name)
+
+            # Importing a.b.c imports a and a.b first.
+            parts = name.split(".")
+            queue.extend(".".join(parts[:i]) for i in range(1, len(parts)))
+
+            path = modules.get(name)
+            if path is None:
+                continue
+            if path.name.endswith(_EXTENSION_SUFFIXES):
+                package = name.rpartition(".")[0] or name
+                queue.extend(m for m in modules if m == package or m.startswith(package + "."))
+                continue
+            if path.suffix == ".py":
+                is_package = path.name == "__init__.py"
+                queue.extend(_imports_of(path, name, is_package, modules))
+
+        return reachable
+
+    def _is_kept(self, name: str) -> bool:
+        for pattern in self.keep:
+            if name == pattern or name.startswith(pattern + "."):
+                return True
+            if fnmatch.fnmatchcase(name, pattern):
+                return True
+        return False
+
+    @staticmethod
+    def _owner(root: Path, rel: Path) -> Optional[str]:
+        """
+        Returns the module a file belongs to, or None for files that are always kept.
+
+        Module files (and their bytecode) belong to their module; any other file
+        belongs to its nearest regular package.
+        """
+        parts = rel.parts
+        if len(parts) == 1:
+            return None
+        if any(p.endswith(_METADATA_SUFFIXES) for p in parts[:-1]):
+            return None
+
+        dirs = list(parts[:-1])
+        file = parts[-1]
+        if dirs[-1] == "__pycache__":
+            dirs = dirs[:-1]
+            file = file.split(".")[0] + ".py"
+            if not dirs:
+                return None
+
+        name = _module_name(file)
+        if name is not None and all(d.isidentifier() for d in dirs):
+            package = ".".join(dirs)
+            return package if name == "__init__" else f"{package}.{name}" if package else name
+
+        # Data file: walk up to the nearest regular package.
+        for depth in range(len(dirs), 0, -1):
+            if (root / Path(*dirs[:depth]) / "__init__.py").exists() and all(
+                d.isidentifier() for d in dirs[:depth]
+            ):
+                return ".".join(dirs[:depth])
+        return None
+
+
+def _module_name(file: str) -> Optional[str]:
+    """Module name for a source or extension file ('x.py', 'x.cpython-312-...so')."""
+    if file.endswith(".py"):
+        stem = file[:-3]
+    elif file.endswith(_EXTENSION_SUFFIXES):
+        stem = file.split(".")[0]
+    else:
+        return None
+    return stem if stem.isidentifier() else None
+
+
+def _imports_of(path: Path, module: str, is_package: bool, modules: Dict[str, Path]) -> List[str]:
+    """Statically collects the module names a source file may import."""
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (SyntaxError, ValueError):
+        return []
+
+    package = module if is_package else module.rpartition(".")[0]
+    found: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                anchor = package.split(".") if package else []
+                anchor = anchor[: len(anchor) - (node.level - 1)] if node.level > 1 else anchor
+                base = ".".join(anchor + ([base] if base else []))
+            if base:
+                found.append(base)
+            for alias in node.names:
+                candidate = f"{base}.{alias.name}" if base else alias.name
+                if candidate in modules:
+                    found.append(candidate)
+        elif isinstance(node, ast.Call) and node.args:
+            func = node.func
+            func_name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+            arg = node.args[0]
+            if func_name in ("import_module", "__import__") and isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                found.append(arg.value)
+    return found
+
+
+def _remove_empty_dirs(root: Path) -> None:
+    for current, dirs, files in os.walk(root, topdown=False):
+        path = Path(current)
+        if path != root and not any(path.iterdir()):
+            path.rmdir()
@@ -1,8 +1,14 @@
+import shutil
+import sys
+import urllib.error
+import urllib.request
+import uuid
 import pytest
 from click.testing import CliRunner
 from lambda_packer.cli import cli
 from pathlib import Path
 import yaml
+import json
 
 def test_cli_build_help():
     runner = CliRunner()
@@ -46,3 +52,247 @@ def test_cli_build_basic(tmp_path, mocker):
     # Check that manifest was generated
     manifest_path = tmp_path / "dist" / "build_manifest.json"
     assert manifest_path.exists()
+
+def test_cli_build_multi_arch_image(tmp_path, mocker):
+    runner = CliRunner()
+
+    config_content = {
+        "runtime_default": "python3.12",
+        "lambdas": {
+            "web": {
+                "path": str(tmp_path / "web"),
+                "type": "image",
+                "handler": "main.handler",
+                "image_tag": "localhost:5000/{name}:{arch}",
+                "multi_arch": True,
+                "platforms": ["linux/amd64", "linux/arm64"],
+            }
+        }
+    }
+
+    config_path = tmp_path / "package_config.yaml"
+    with open(config_path, "w") as f:
+        yaml.dump(config_content, f)
+
+    web_dir = tmp_path / "web"
+    web_dir.mkdir()
+    (web_dir / "main.py").write_text("def handler(): pass")
+
+    mock_build = mocker.patch("lambda_packer.cli.BuildKitBuilder.build", return_value=None)
+
+    result = runner.invoke(cli, ["build", "--config", str(config_path), "--dist", str(tmp_path / "dist")])
+
+    assert result.exit_code == 0
+    assert "Found 1 build tasks" in result.output
+
+    # One BuildKit run covers both platforms and writes a local OCI layout.
+    mock_build.assert_called_once()
+    kwargs = mock_build.call_args.kwargs
+    assert kwargs["platforms"] == ["linux/amd64", "linux/arm64"]
+    assert kwargs["output_type"] == "oci"
+    assert kwargs["output_dest"] == tmp_path / "dist" / "web" / "oci"
+    assert kwargs["tags"] == ["localhost:5000/web:latest"]
+
+    manifest = json.loads((tmp_path / "dist" / "build_manifest.json").read_text())
+    assert manifest["artifacts"][0]["path"] == "web/oci"
+    assert manifest["artifacts"][0]["metadata"]["index"] is True
+
+REGISTRY = "localhost:5000"
+
+INDEX_MEDIA_TYPES = (
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+)
+
+def _registry_available():
+    try:
+        with urllib.request.urlopen(f"http://{REGISTRY}/v2/", timeout=2):
+            return True
+    except (urllib.error.URLError, OSError):
+        return False
+
+@pytest.mark.skipif(
+    not (shutil.which("docker") and _registry_available()),
+    reason=f"requires docker and a registry:2 instance at {REGISTRY}",
+)
+def test_cli_build_multi_arch_image_push_integration(tmp_path):
+    runner = CliRunner()
+    tag = uuid.uuid4().hex[:12]
+
+    config_content = {
+        "runtime_default": "python3.12",
+        "lambdas": {
+            "web": {
+                "path": str(tmp_path / "web"),
+                "type": "image",
+                "handler": "main.handler",
+                "image_tag": f"{REGISTRY}/lambda-packer-{{name}}:{tag}",
+                "multi_arch": True,
+                "platforms": ["linux/amd64", "linux/arm64"],
+            }
+        }
+    }
+
+    config_path = tmp_path / "package_config.yaml"
+    with open(config_path, "w") as f:
+        yaml.dump(config_content, f)
+
+    web_dir = tmp_path / "web"
+    web_dir.mkdir()
+    (web_dir / "main.py").write_text("def handler(): pass")
+
+    result = runner.invoke(
+        cli, ["build", "--config", str(config_path), "--dist", str(tmp_path / "dist"), "--push"]
+    )
+    assert result.exit_code == 0, result.output
+
+    manifest = json.loads((tmp_path / "dist" / "build_manifest.json").read_text())
+    assert manifest["artifacts"][0]["path"] == f"{REGISTRY}/lambda-packer-web:{tag}"
+
+    # A single tag resolves to one manifest index covering both platforms.
+    request = urllib.request.Request(
+        f"http://{REGISTRY}/v2/lambda-packer-web/manifests/{tag}",
+        headers={"Accept": ", ".join(INDEX_MEDIA_TYPES)},
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        assert response.headers["Content-Type"] in INDEX_MEDIA_TYPES
+        index = json.load(response)
+
+    platforms = {
+        f"{m['platform']['os']}/{m['platform']['architecture']}"
+        for m in index["manifests"]
+        # BuildKit attestation manifests are listed with an "unknown" platform.
+        if m["platform"]["os"] != "unknown"
+    }
+    assert platforms == {"linux/amd64", "linux/arm64"}
+
+def test_cli_plan_lists_tasks(tmp_path):
+    runner = CliRunner()
+
+    config_content = {
+        "lambdas": {
+            "api": {
+                "path": str(tmp_path / "api"),
+                "type": "zip",
+                "platforms": ["linux/amd64", "linux/arm64"],
+            }
+        }
+    }
+
+    config_path = tmp_path / "package_config.yaml"
+    with open(config_path, "w") as f:
+        yaml.dump(config_content, f)
+
+    result = runner.invoke(cli, ["plan", "--config", str(config_path)])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [
+        "lambda\tapi\tzip\tlinux/amd64",
+        "lambda\tapi\tzip\tlinux/arm64",
+    ]
+
+def test_cli_profile_updates_manifest(tmp_path):
+    runner = CliRunner()
+
+    config_path = tmp_path / "package_config.yaml"
+    with open(config_path, "w") as f:
+        yaml.dump({"lambdas": {"api": {"path": "api", "type": "zip", "handler": "main.handler"}}}, f)
+
+    dist = tmp_path / "dist"
+    asset = dist / "api" / "amd64" / "asset"
+    asset.mkdir(parents=True)
+    (asset / "main.py").write_text("import json\n\ndef handler(event, context): pass\n")
+    (dist / "build_manifest.json").write_text(json.dumps({"artifacts": [
+        {"name": "api", "type": "lambda", "path": "api-amd64.zip",
+         "metadata": {"platform": "linux/amd64", "size": 10}}
+    ]}))
+
+    result = runner.invoke(cli, [
+        "profile", "api", "--config", str(config_path), "--dist", str(dist),
+        "--platform", "linux/amd64",
+    ])
+
+    assert result.exit_code == 0, result.output
+    assert "Import time for api (linux/amd64)" in result.output
+
+    manifest = json.loads((dist / "build_manifest.json").read_text())
+    metadata = manifest["artifacts"][0]["metadata"]
+    assert metadata["size"] == 10
+    assert "main" in metadata["import_profile"]["packages"]
+
+def test_cli_build_shard(tmp_path, mocker):
+    runner = CliRunner()
+
+    config_content = {
+        "lambdas": {
+            name: {"path": str(tmp_path), "type": "zip"} for name in ("a", "b", "c")
+        }
+    }
+    config_path = tmp_path / "package_config.yaml"
+    with open(config_path, "w") as f:
+        yaml.dump(config_content, f)
+
+    mock_process = mocker.patch("lambda_packer.cli.process_target_platform")
+
+    result = runner.invoke(cli, [
+        "build", "--config", str(config_path), "--dist", str(tmp_path / "dist"), "--shard", "2/2"
+    ])
+
+    assert result.exit_code == 0, result.output
+    assert "Shard 2/2: 1 of 3 tasks" in result.output
+    assert mock_process.call_count == 1
+
+    manifest = json.loads((tmp_path / "dist" / "build_manifest.json").read_text())
+    assert manifest["summary"]["shard"] == {"index": 2, "count": 2}
+
+def test_cli_build_shard_rejects_bad_spec(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(cli, ["build", "--shard", "3/2"])
+    assert result.exit_code != 0
+    assert "shard index must be between 1 and N" in result.output
+
+def test_cli_merge_manifests(tmp_path):
+    runner = CliRunner()
+
+    for shard, name in ((1, "api"), (2, "web")):
+        shard_dist = tmp_path / f"shard{shard}"
+        shard_dist.mkdir()
+        (shard_dist / "build_manifest.json").write_text(json.dumps({
+            "artifacts": [{"name": name, "type": "lambda", "path": f"{name}-amd64.zip",
+                           "metadata": {"platform": "linux/amd64"}}],
+            "summary": {"shard": {"index": shard, "count": 2}},
+        }))
+
+    result = runner.invoke(cli, [
+        "merge-manifests",
+        str(tmp_path / "shard1" / "build_manifest.json"),
+        str(tmp_path / "shard2"),
+        "-o", str(tmp_path / "dist"),
+    ])
+
+    assert result.exit_code == 0, result.output
+    merged = json.loads((tmp_path / "dist" / "build_manifest.json").read_text())
+    assert [a["name"] for a in merged["artifacts"]] == ["api", "web"]
+    assert "summary" not in merged
+
+def test_cli_build_concurrency_defaults_to_builder_pool(tmp_path, mocker):
+    (tmp_path / "api").mkdir()
+    config_path = tmp_path / "package_config.yaml"
+    config_path.write_text(yaml.dump({
+        "builders": [
+            {"name": "amd", "platforms": ["linux/amd64"], "concurrency": 2},
+            {"name": "arm", "platforms": ["linux/arm64"], "concurrency": 3},
+        ],
+        "lambdas": {"api": {"path": str(tmp_path / "api"), "type": "zip"}},
+    }))
+    mocker.patch("lambda_packer.cli.process_target_platform")
+    run_build = mocker.spy(sys.modules["lambda_packer.cli"], "run_build")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["build", "--config", str(config_path), "--dist", str(tmp_path / "dist")])
+    assert result.exit_code == 0, result.output
+    assert "Parallelism: 5" in result.output
+    assert run_build.call_args.kwargs["pool"].concurrency == 5
+
+    result = runner.invoke(cli, ["build", "--config", str(config_path), "--dist", str(tmp_path / "dist"), "-j", "2"])
+    assert "Parallelism: 2" in result.output
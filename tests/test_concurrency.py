@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+
+import yaml
+from click.testing import CliRunner
+
+from lambda_packer.cli import cli
+from lambda_packer.concurrency import AdaptiveConcurrency
+from lambda_packer.exporters.zip import ZipExporter
+
+GiB = 1024 * 1024 * 1024
+
+
+def test_initial_limits_from_cpu_and_memory():
+    auto = AdaptiveConcurrency(cpus=4, memory=lambda: 8 * GiB)
+    assert (auto.build_limit, auto.local_limit) == (8, 4)
+    assert auto.max_workers == 12
+
+    # Little memory: fewer builds, and one local task at a time.
+    auto = AdaptiveConcurrency(cpus=4, memory=lambda: GiB // 2)
+    assert (auto.build_limit, auto.local_limit) == (4, 1)
+    assert auto.history[0]["reason"] == "initial"
+
+
+def test_limits_follow_available_memory():
+    memory = [8 * GiB]
+    auto = AdaptiveConcurrency(cpus=4, memory=lambda: memory[0])
+
+    memory[0] = GiB
+    with auto.phase("build"):
+        pass
+    assert (auto.build_limit, auto.local_limit) == (8, 2)
+    assert [h["reason"] for h in auto.history] == ["initial", "memory"]
+    assert auto.history[-1]["memory_mb"] == 1024
+
+
+def test_disk_throughput_caps_local_limit():
+    auto = AdaptiveConcurrency(cpus=8, memory=lambda: None)
+    assert auto.local_limit == 8
+
+    auto.record_export(1, 100, 1.0)
+    auto.record_export(2, 60, 1.0)  # 120/s in aggregate: still scaling
+    assert auto.local_limit == 8
+    auto.record_export(3, 35, 1.0)  # 105/s: a third export only adds contention
+    assert auto.local_limit == 2
+    assert auto.history[-1]["reason"] == "disk"
+
+
+def test_builds_overlap_with_local_phases():
+    auto = AdaptiveConcurrency(cpus=1, memory=lambda: None)
+    exporting = threading.Event()
+    release = threading.Event()
+    staged = threading.Event()
+
+    def export():
+        with auto.phase("export"):
+            exporting.set()
+            release.wait(timeout=5)
+
+    def stage():
+        with auto.phase("stage"):
+            staged.set()
+
+    threads = [threading.Thread(target=export), threading.Thread(target=stage)]
+    threads[0].start()
+    assert exporting.wait(timeout=5)
+    threads[1].start()
+
+    # The local slot is taken, but BuildKit builds are still admitted.
+    with auto.phase("build"):
+        pass
+    assert not staged.wait(timeout=0.2)
+
+    release.set()
+    for t in threads:
+        t.join(timeout=5)
+    assert staged.is_set()
+    assert auto.report()["peak"] == {"stage": 1, "build": 1, "export": 1}
+
+
+def test_phased_exporter_counts_bytes_from_exporter(tmp_path, mocker):
+    src = tmp_path / "asset"
+    (src / "pkg").mkdir(parents=True)
+    (src / "main.py").write_bytes(b"x" * 300)
+    (src / "pkg" / "mod.py").write_bytes(b"y" * 700)
+    dest = tmp_path / "out.zip"
+
+    auto = AdaptiveConcurrency(cpus=2, memory=lambda: None)
+    record = mocker.spy(auto, "record_export")
+    walk = mocker.spy(os, "walk")
+
+    assert auto.wrap_exporter(ZipExporter()).export(src, dest) == 1000
+    # Only the exporter itself walks the tree.
+    assert walk.call_count == 1
+    level, written, _ = record.call_args.args
+    assert (level, written) == (1, 1000 + dest.stat().st_size)
+
+
+def test_cli_build_auto_concurrency(tmp_path, mocker):
+    (tmp_path / "api").mkdir()
+    config_path = tmp_path / "package_config.yaml"
+    config_path.write_text(
+        yaml.dump({"lambdas": {"api": {"path": str(tmp_path / "api"), "type": "zip"}}})
+    )
+    mocker.patch("lambda_packer.cli.process_target_platform")
+    dist = tmp_path / "dist"
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["build", "--config", str(config_path), "--dist", str(dist), "-j", "auto"])
+    assert result.exit_code == 0, result.output
+    assert "[-j auto" in result.output
+
+    manifest = json.loads((dist / "build_manifest.json").read_text())
+    assert manifest["summary"]["concurrency"]["history"][0]["reason"] == "initial"
+
+    result = runner.invoke(cli, ["build", "--config", str(config_path), "-j", "0"])
+    assert result.exit_code != 0
+    assert "must be at least 1" in result.output
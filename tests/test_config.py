@@ -1,5 +1,6 @@
 import pytest
 import yaml
+from pydantic import ValidationError
 from pathlib import Path
 from lambda_packer.config import PackageConfig, ArtifactType, LambdaConfig, LayerConfig
 
@@ -53,3 +54,33 @@ def test_config_invalid_type(tmp_path):
     
     with pytest.raises(Exception): # Pydantic ValidationError
         PackageConfig.from_yaml(config_path)
+
+def test_lambda_prune_config():
+    enabled = LambdaConfig.model_validate(
+        {"path": "api", "type": "zip", "handler": "app.handler", "prune": True}
+    )
+    assert enabled.prune.keep == []
+    assert enabled.prune.verify is True
+
+    custom = LambdaConfig.model_validate(
+        {
+            "path": "api",
+            "type": "zip",
+            "handler": "app.handler",
+            "prune": {"keep": ["plugins.*"], "verify": False},
+        }
+    )
+    assert custom.prune.keep == ["plugins.*"]
+    assert custom.prune.verify is False
+
+    assert LambdaConfig.model_validate({"path": "api", "type": "zip"}).prune is None
+    assert LambdaConfig.model_validate({"path": "api", "type": "zip", "prune": False}).prune is None
+
+def test_lambda_prune_requires_zip_with_handler():
+    with pytest.raises(ValidationError, match="prune requires a handler"):
+        LambdaConfig.model_validate({"path": "api", "type": "zip", "prune": True})
+
+    with pytest.raises(ValidationError, match="only supported for 'zip'"):
+        LambdaConfig.model_validate(
+            {"path": "web", "type": "image", "handler": "app.handler", "prune": True}
+        )
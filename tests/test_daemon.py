@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+
+from lambda_packer.config import ArtifactType, BuilderConfig, LambdaConfig, PackageConfig
+from lambda_packer.daemon import BuildDaemon, FileHashCache, StagedContextCache, send_request
+from lambda_packer.planner import Planner
+
+def test_file_hash_cache_invalidates_on_mtime(tmp_path):
+    cache = FileHashCache()
+    src = tmp_path / "main.py"
+    src.write_text("a = 1")
+
+    first = cache.file_digest(src)
+    assert cache.file_digest(src) == first
+
+    src.write_text("a = 2")
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.file_digest(src) != first
+
+def test_staged_context_reused_until_inputs_change(tmp_path):
+    api_dir = tmp_path / "api"
+    api_dir.mkdir()
+    (api_dir / "main.py").write_text("def handler(): pass")
+
+    config = PackageConfig(
+        lambdas={"api": LambdaConfig(path=api_dir, type=ArtifactType.ZIP)}
+    )
+    target = Planner(config).plan()[0]
+    contexts = StagedContextCache(tmp_path / "contexts", FileHashCache())
+
+    with contexts.stage(target, config) as (first, has_requirements, _):
+        assert (first / "src" / "main.py").exists()
+        assert has_requirements is False
+    with contexts.stage(target, config) as (second, _, _):
+        assert second == first
+
+    (api_dir / "extra.py").write_text("")
+    with contexts.stage(target, config) as (third, _, _):
+        assert third != first
+        assert (third / "src" / "extra.py").exists()
+
+    # The superseded context is removed once no build uses it.
+    assert not first.exists()
+
+def test_daemon_serves_build_requests(tmp_path, mocker):
+    api_dir = tmp_path / "api"
+    api_dir.mkdir()
+    (api_dir / "main.py").write_text("def handler(): pass")
+    config_path = tmp_path / "package_config.yaml"
+    config_path.write_text("lambdas:\n  api:\n    path: api\n    type: zip\n")
+
+    def fake_build(**kwargs):
+        kwargs["output_dest"].mkdir(parents=True)
+        (kwargs["output_dest"] / "main.py").write_text("def handler(): pass")
+
+    mock_build = mocker.patch(
+        "lambda_packer.daemon.BuildKitBuilder.build", side_effect=fake_build
+    )
+
+    daemon = BuildDaemon(tmp_path / "d.sock", concurrency=2)
+    server = threading.Thread(target=daemon.serve_forever)
+    server.start()
+    try:
+        while not daemon.socket_path.exists():
+            time.sleep(0.01)
+        assert send_request(daemon.socket_path, {"command": "ping"}) == {"ok": True}
+
+        request = {
+            "command": "build",
+            "config": str(config_path),
+            "dist": str(tmp_path / "dist"),
+            # Relative config paths resolve against the client's directory.
+            "cwd": str(tmp_path),
+        }
+        response = send_request(daemon.socket_path, request)
+        assert response["ok"] is True
+        assert response["artifacts"][0]["path"] == "api-amd64.zip"
+
+        # A repeat build reuses the staged context.
+        send_request(daemon.socket_path, request)
+        contexts = [call.kwargs["context_path"] for call in mock_build.call_args_list]
+        assert contexts[0] == contexts[1]
+    finally:
+        daemon.shutdown()
+        server.join()
+
+    assert not daemon.socket_path.exists()
+    assert (tmp_path / "dist" / "build_manifest.json").exists()
+
+def test_daemon_shares_builder_pool_across_requests(tmp_path):
+    daemon = BuildDaemon(tmp_path / "d.sock")
+    try:
+        amd = [BuilderConfig(name="amd", platforms=["linux/amd64"], concurrency=2)]
+        pool = daemon._pool(amd)
+        # Equal configs from separate requests map to the same pool and limits.
+        assert daemon._pool([BuilderConfig(name="amd", platforms=["linux/amd64"], concurrency=2)]) is pool
+        assert daemon._pool([BuilderConfig(name="amd", concurrency=4)]) is not pool
+        assert daemon._pool([]) is None
+    finally:
+        daemon.close()
+
+def test_daemon_reports_builders_per_request(tmp_path, mocker):
+    (tmp_path / "api").mkdir()
+    (tmp_path / "api" / "main.py").write_text("def handler(): pass")
+    config_path = tmp_path / "package_config.yaml"
+    config_path.write_text(
+        "builders:\n"
+        "  - {name: amd, platforms: [linux/amd64], concurrency: 2}\n"
+        "  - {name: arm, platforms: [linux/arm64], concurrency: 1}\n"
+        "lambdas:\n  api:\n    path: api\n    type: zip\n"
+    )
+
+    def fake_build(**kwargs):
+        kwargs["output_dest"].mkdir(parents=True, exist_ok=True)
+        (kwargs["output_dest"] / "main.py").write_text("def handler(): pass")
+
+    mocker.patch("lambda_packer.builders.buildkit.BuildKitBuilder.build", side_effect=fake_build)
+
+    daemon = BuildDaemon(tmp_path / "d.sock")
+    try:
+        for dist in ("dist1", "dist2"):
+            request = {"command": "build", "config": str(config_path), "dist": str(tmp_path / dist), "cwd": str(tmp_path)}
+            assert daemon.handle(request)["ok"] is True
+        # Without -j, the workers follow the builder pool's total concurrency.
+        assert daemon.workers == 3
+    finally:
+        daemon.close()
+
+    summary = json.loads((tmp_path / "dist2" / "build_manifest.json").read_text())["summary"]
+    # The shared pool ran two tasks; the second request reports only its own.
+    assert summary["builders"]["amd"]["tasks"] == 1
+    assert summary["builders"]["arm"]["tasks"] == 0
+
+def test_daemon_auto_concurrency_uses_adaptive_limits(tmp_path):
+    daemon = BuildDaemon(tmp_path / "d.sock", concurrency="auto")
+    try:
+        assert daemon.adaptive is not None
+        assert daemon.workers == daemon.adaptive.max_workers
+    finally:
+        daemon.close()
@@ -30,3 +30,28 @@ def test_dockerfile_gen_image_with_layers():
     assert "FROM public.ecr.aws/lambda/python:3.12" in df
     assert 'CMD [ "app.handler" ]' in df
     assert "COPY --from=layer-common /asset/python/ ." in df
+
+def test_dockerfile_gen_installers():
+    generator = DockerfileGenerator()
+    df = generator.generate(
+        runtime="python3.12",
+        requirements=True,
+        layers=["common"],
+        layer_requirements={"common": True},
+        installer="uv",
+        layer_installers={"common": "pip"},
+    )
+
+    # Builder stage uses uv with its own cache mount.
+    assert "uv pip install --python python -r /tmp/requirements.txt --target ." in df
+    assert "--mount=type=cache,target=/root/.cache/uv" in df
+    # The layer stage keeps pip.
+    assert "pip install -r /tmp/requirements.txt -t ." in df
+    assert "--mount=type=cache,target=/root/.cache/pip" in df
+
+def test_dockerfile_gen_defaults_to_pip():
+    generator = DockerfileGenerator()
+    df = generator.generate(runtime="python3.12", requirements=True)
+
+    assert "pip install -r /tmp/requirements.txt -t ." in df
+    assert "uv pip install" not in df
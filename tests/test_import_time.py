@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+# Startup budget for `import lambda_packer.cli`, in milliseconds.
+# See benchmarks/import_time.py for a per-module breakdown.
+IMPORT_BUDGET_MS = 150
+
+HEAVY_MODULES = ["pydantic", "jinja2", "yaml"]
+
+def run_isolated(code):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+def test_cli_import_skips_heavy_modules():
+    result = run_isolated(
+        "import sys, lambda_packer.cli; "
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    assert result.stdout.strip() == "[]"
+
+def test_cli_import_within_budget():
+    # Take the best of a few runs to smooth out noise on shared CI machines.
+    timings = []
+    for _ in range(3):
+        result = run_isolated("import lambda_packer.cli")
+        line = next(
+            l for l in result.stderr.splitlines() if l.endswith("| lambda_packer.cli")
+        )
+        timings.append(int(line.split("|")[1]) / 1000)
+    assert min(timings) < IMPORT_BUDGET_MS
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import shutil
+import zipfile
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from lambda_packer.builders.llb import (
+    LLBBuilder,
+    LLBGraph,
+    _varint,
+    normalize_image,
+    stage_shared_context,
+)
+from lambda_packer.cli import cli
+from lambda_packer.config import PackageConfig
+from lambda_packer.planner import Planner
+
+
+def _fields(data):
+    """Decodes the top-level (field, value) pairs of a protobuf message."""
+    pos, fields = 0, []
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        if key & 7 == 2:
+            length, pos = _read_varint(data, pos)
+            fields.append((key >> 3, data[pos : pos + length]))
+            pos += length
+        else:
+            value, pos = _read_varint(data, pos)
+            fields.append((key >> 3, value))
+    return fields
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        value |= (byte & 0x7F) << shift
+        pos += 1
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def _write_config(tmp_path, lambdas):
+    layer_dir = tmp_path / "common"
+    layer_dir.mkdir()
+    (layer_dir / "common.py").write_text("X = 1")
+    for name in lambdas:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "main.py").write_text("def handler(e, c): pass")
+    config = {
+        "runtime_default": "python3.12",
+        "layers": {"common": {"path": str(layer_dir)}},
+        "lambdas": {
+            name: {"path": str(tmp_path / name), "layers": ["common"], **options}
+            for name, options in lambdas.items()
+        },
+    }
+    config_path = tmp_path / "package_config.yaml"
+    config_path.write_text(yaml.dump(config))
+    return config_path
+
+
+def test_varint_encoding():
+    assert _varint(1) == b"\x01"
+    assert _varint(300) == b"\xac\x02"
+    # Negative values are sign-extended to 64 bits, as protobuf does for int64.
+    assert _varint(-1) == b"\xff" * 9 + b"\x01"
+
+
+def test_normalize_image():
+    assert normalize_image("python:3.12-slim") == "docker.io/library/python:3.12-slim"
+    assert normalize_image("org/img:1") == "docker.io/org/img:1"
+    assert normalize_image("ghcr.io/astral-sh/uv:0.9") == "ghcr.io/astral-sh/uv:0.9"
+
+
+def test_graph_deduplicates_identical_ops():
+    graph = LLBGraph()
+    first = graph.image("python:3.12-slim", "linux/amd64")
+    assert graph.image("python:3.12-slim", "linux/amd64") == first
+    assert graph.image("python:3.12-slim", "linux/arm64") != first
+
+    definition = graph.marshal(first)
+    ops = [value for field, value in _fields(definition) if field == 1]
+    # Two source ops plus the sink pointing at the result.
+    assert len(ops) == 3
+    for op in ops[:-1]:
+        assert any(f"sha256:{hashlib.sha256(op).hexdigest()}".encode() in v for _, v in _fields(definition))
+
+
+def test_definition_shares_base_image_and_layers(tmp_path):
+    config_path = _write_config(
+        tmp_path, {"api": {"type": "zip"}, "worker": {"type": "zip", "installer": "uv"}}
+    )
+    (tmp_path / "common-reqs.txt").write_text("requests\n")
+    config = yaml.safe_load(config_path.read_text())
+    config["layers"]["common"]["requirements"] = str(tmp_path / "common-reqs.txt")
+    config_path.write_text(yaml.dump(config))
+
+    pkg_cfg = PackageConfig.from_yaml(config_path)
+    tasks = [(t, p) for t in Planner(pkg_cfg).plan() if t.type == "lambda" for p in t.platforms]
+    requirements, layer_requirements = stage_shared_context(tasks, pkg_cfg, tmp_path / "ctx")
+    assert requirements == {"api": False, "worker": False}
+    assert layer_requirements == {"common": True}
+    assert (tmp_path / "ctx" / "layers" / "common" / "src" / "common.py").exists()
+
+    builder = LLBBuilder()
+    definition = builder.definition(tasks, pkg_cfg, requirements, layer_requirements)
+    assert definition == builder.definition(tasks, pkg_cfg, requirements, layer_requirements)
+
+    ops = [value for field, value in _fields(definition) if field == 1]
+    sources = [op for op in ops if b"docker-image://" in op]
+    assert len(sources) == 1
+    assert b"docker.io/library/python:3.12-slim" in sources[0]
+    assert sum(b"local://context" in op for op in ops) == 1
+    # The layer is installed and copied once, although both lambdas use it.
+    assert sum(b"pip\x0a\x07install" in op for op in ops) == 1
+    assert sum(b"/layers/common/src/" in op for op in ops) == 1
+    assert b"/targets/api/src/" in definition
+    assert b"/targets/worker/src/" in definition
+
+
+def test_cli_build_llb_backend(tmp_path, mocker):
+    config_path = _write_config(
+        tmp_path, {"api": {"type": "zip"}, "web": {"type": "image"}}
+    )
+    dist = tmp_path / "dist"
+
+    def solve(cmd, input=None):
+        assert cmd[:2] == ["buildctl", "build"]
+        context = cmd[cmd.index("--local") + 1].split("=", 1)[1]
+        dest = cmd[cmd.index("--output") + 1].split("dest=", 1)[1]
+        for name in os.listdir(os.path.join(context, "targets")):
+            shutil.copytree(os.path.join(context, "targets", name, "src"), os.path.join(dest, name, "amd64"))
+        return {"total_steps": 5, "cached_steps": 2, "cache_hit_ratio": 0.4, "bytes": 0, "steps": []}
+
+    run = mocker.patch("lambda_packer.builders.llb.run_with_progress", side_effect=solve)
+    mock_process = mocker.patch("lambda_packer.cli.process_target_platform")
+
+    result = CliRunner().invoke(
+        cli,
+        ["build", "--config", str(config_path), "--dist", str(dist), "--backend", "llb"],
+    )
+    assert result.exit_code == 0, result.output
+
+    run.assert_called_once()
+    # Image targets keep using the Dockerfile path.
+    assert [c.args[0].name for c in mock_process.call_args_list] == ["web"]
+
+    with zipfile.ZipFile(dist / "api-amd64.zip") as zf:
+        assert zf.namelist() == ["main.py"]
+    manifest = json.loads((dist / "build_manifest.json").read_text())
+    assert manifest["summary"]["llb"]["tasks"] == 2  # api and the common layer
+    assert (dist / "common-amd64.zip").exists()
+
+
+@pytest.mark.skipif(
+    not (shutil.which("buildctl") and os.environ.get("BUILDKIT_HOST")),
+    reason="requires buildctl and a buildkitd at $BUILDKIT_HOST",
+)
+def test_llb_build_integration(tmp_path):
+    config_path = _write_config(tmp_path, {"api": {"type": "zip"}})
+    pkg_cfg = PackageConfig.from_yaml(config_path)
+    tasks = [(t, "linux/amd64") for t in Planner(pkg_cfg).plan() if t.name == "api"]
+
+    LLBBuilder().build(tasks, pkg_cfg, tmp_path / "out")
+    assert (tmp_path / "out" / "api" / "amd64" / "main.py").exists()
+    assert (tmp_path / "out" / "api" / "amd64" / "common.py").exists()
+
+
+def test_cli_build_llb_backend_rejects_daemon(tmp_path):
+    config_path = _write_config(tmp_path, {"api": {"type": "zip"}})
+
+    for args in (["--backend", "llb"], ["--buildkit-addr", "unix:///run/buildkit.sock"]):
+        result = CliRunner().invoke(
+            cli, ["build", "--config", str(config_path), "--daemon", str(tmp_path / "d.sock"), *args]
+        )
+        assert result.exit_code == 2
+        assert "cannot be used with --daemon" in result.output
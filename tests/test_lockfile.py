@@ -0,0 +1,104 @@
+import hashlib
+import json
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from lambda_packer.builders.dockerfile import DockerfileGenerator
+from lambda_packer.cli import cli
+from lambda_packer.lockfile import BaseImageLock, resolve_image
+
+INDEX = json.dumps({
+    "mediaType": "application/vnd.oci.image.index.v1+json",
+    "manifests": [
+        {"digest": "sha256:amd", "platform": {"os": "linux", "architecture": "amd64"}},
+        {"digest": "sha256:arm", "platform": {"os": "linux", "architecture": "arm64", "variant": "v8"}},
+        {"digest": "sha256:arm-plain", "platform": {"os": "linux", "architecture": "arm64"}},
+        {"digest": "sha256:att", "platform": {"os": "unknown", "architecture": "unknown"}},
+    ],
+}).encode()
+INDEX_DIGEST = "sha256:" + hashlib.sha256(INDEX).hexdigest()
+
+def test_resolve_image_index():
+    entry = resolve_image("python:3.12-slim", ["linux/amd64", "linux/arm64"], inspect=lambda ref: INDEX)
+    assert entry == {
+        "digest": INDEX_DIGEST,
+        "platforms": {"linux/amd64": "sha256:amd", "linux/arm64": "sha256:arm-plain"},
+    }
+
+def test_resolve_image_matches_variant():
+    index = json.dumps({"manifests": [
+        {"digest": "sha256:arm", "platform": {"os": "linux", "architecture": "arm64", "variant": "v8"}},
+    ]}).encode()
+    entry = resolve_image("python:3.12-slim", ["linux/arm64"], inspect=lambda ref: index)
+    assert entry["platforms"] == {"linux/arm64": "sha256:arm"}
+
+def test_resolve_image_single_manifest():
+    raw = json.dumps({"mediaType": "application/vnd.oci.image.manifest.v1+json", "layers": []}).encode()
+    entry = resolve_image("img:1", ["linux/amd64"], inspect=lambda ref: raw)
+    digest = "sha256:" + hashlib.sha256(raw).hexdigest()
+    assert entry == {"digest": digest, "platforms": {"linux/amd64": digest}}
+
+def test_resolve_image_missing_platform():
+    with pytest.raises(ValueError, match="linux/s390x"):
+        resolve_image("python:3.12-slim", ["linux/s390x"], inspect=lambda ref: INDEX)
+
+def test_lock_pins_per_platform(tmp_path):
+    lock = BaseImageLock(tmp_path / "lambda-packer.lock")
+    lock.update({"python:3.12-slim": {"linux/amd64", "linux/arm64"}}, inspect=lambda ref: INDEX)
+    lock.save()
+    lock = BaseImageLock.load(tmp_path / "lambda-packer.lock")
+
+    assert lock.pin("python:3.12-slim", ["linux/arm64"]) == "python:3.12-slim@sha256:arm-plain"
+    assert lock.pin("python:3.12-slim", ["linux/amd64", "linux/arm64"]) == f"python:3.12-slim@{INDEX_DIGEST}"
+    # Unlocked images and platforms fall back to the tag.
+    assert lock.pin("python:3.11-slim", ["linux/amd64"]) == "python:3.11-slim"
+    assert lock.pin("python:3.12-slim", ["linux/s390x"]) == "python:3.12-slim"
+
+def test_dockerfile_gen_uses_pinned_images(tmp_path):
+    lock = BaseImageLock(tmp_path / "lambda-packer.lock", {
+        "python:3.12-slim": {"digest": "sha256:idx", "platforms": {"linux/amd64": "sha256:slim"}},
+        "public.ecr.aws/lambda/python:3.12": {"digest": "sha256:idx2", "platforms": {"linux/amd64": "sha256:base"}},
+    })
+    df = DockerfileGenerator(lock=lock).generate(
+        runtime="python3.12", is_image=True, platforms=["linux/amd64"]
+    )
+
+    assert "FROM python:3.12-slim@sha256:slim AS builder" in df
+    assert "FROM public.ecr.aws/lambda/python:3.12@sha256:base" in df
+
+def test_dockerfile_gen_pins_frontend(tmp_path):
+    lock = BaseImageLock(tmp_path / "lambda-packer.lock", {
+        "docker/dockerfile:1.4": {"digest": "sha256:front", "platforms": {}},
+    })
+    df = DockerfileGenerator(lock=lock).generate(runtime="python3.12", platforms=["linux/arm64"])
+
+    # The directive must stay on the first line for BuildKit to honour it.
+    assert df.splitlines()[0] == "# syntax=docker/dockerfile:1.4@sha256:front"
+    assert DockerfileGenerator().generate(runtime="python3.12").startswith("# syntax=docker/dockerfile:1.4\n")
+
+def test_cli_update_base_images(tmp_path, mocker):
+    config_path = tmp_path / "package_config.yaml"
+    with open(config_path, "w") as f:
+        yaml.dump({"lambdas": {
+            "api": {"path": "api", "type": "zip", "platforms": ["linux/amd64", "linux/arm64"]},
+            "web": {"path": "web", "type": "image", "handler": "main.handler", "installer": "uv"},
+        }}, f)
+    inspect = mocker.patch("lambda_packer.lockfile._inspect_raw", return_value=INDEX)
+
+    result = CliRunner().invoke(cli, ["update-base-images", "--config", str(config_path)])
+
+    assert result.exit_code == 0, result.output
+    lock = json.loads((tmp_path / "lambda-packer.lock").read_text())
+    assert sorted(lock["images"]) == [
+        "docker/dockerfile:1.4",
+        "ghcr.io/astral-sh/uv:0.9",
+        "public.ecr.aws/lambda/python:3.12",
+        "python:3.12-slim",
+    ]
+    assert lock["images"]["python:3.12-slim"]["platforms"] == {
+        "linux/amd64": "sha256:amd", "linux/arm64": "sha256:arm-plain"
+    }
+    assert lock["images"]["docker/dockerfile:1.4"] == {"digest": INDEX_DIGEST, "platforms": {}}
+    assert inspect.call_count == 4
@@ -22,3 +22,30 @@ def test_oci_exporter_args():
         "tags": ["tag1"],
         "push": True
     }
+
+def test_oci_exporter_index_tag():
+    exporter = OCIExporter()
+    assert exporter.resolve_index_tag(name="my-lambda") == "lambda-packer/my-lambda:latest"
+    tag = exporter.resolve_index_tag(
+        name="my-lambda",
+        custom_tag="localhost:5000/{name}:{arch}"
+    )
+    assert tag == "localhost:5000/my-lambda:latest"
+
+def test_oci_exporter_index_args_push():
+    exporter = OCIExporter()
+    args = exporter.get_index_export_args(tags=["tag1"], push=True)
+    assert args == {
+        "output_type": "image",
+        "tags": ["tag1"],
+        "push": True
+    }
+
+def test_oci_exporter_index_args_local_layout(tmp_path):
+    exporter = OCIExporter()
+    args = exporter.get_index_export_args(tags=["tag1"], layout_dest=tmp_path / "oci")
+    assert args == {
+        "output_type": "oci",
+        "output_dest": tmp_path / "oci",
+        "tags": ["tag1"],
+    }
@@ -1,6 +1,6 @@
 import pytest
 from pathlib import Path
-from lambda_packer.config import PackageConfig, ArtifactType, LambdaConfig, LayerConfig
+from lambda_packer.config import PackageConfig, ArtifactType, Installer, LambdaConfig, LayerConfig
 from lambda_packer.planner import Planner
 
 def test_planner_creates_targets():
@@ -60,3 +60,98 @@ def test_planner_dependency_graph():
         "api": {"layer1", "layer2"},
         "web": set()
     }
+
+def test_planner_resolves_installer():
+    config = PackageConfig(
+        installer_default=Installer.UV,
+        layers={
+            "common": LayerConfig(path=Path("common"), installer=Installer.PIP)
+        },
+        lambdas={
+            "api": LambdaConfig(path=Path("api"), type=ArtifactType.ZIP)
+        }
+    )
+
+    targets = {t.name: t for t in Planner(config).plan()}
+
+    assert targets["common"].installer == Installer.PIP
+    assert targets["api"].installer == Installer.UV
+
+def make_shard_config(tmp_path):
+    (tmp_path / "reqs.txt").write_text("requests\nboto3\n# comment\nnumpy\n")
+    return PackageConfig(
+        layers={
+            "common": LayerConfig(path=tmp_path, platforms=["linux/amd64", "linux/arm64"])
+        },
+        lambdas={
+            "api": LambdaConfig(path=tmp_path, type=ArtifactType.ZIP, layers=["common"], platforms=["linux/amd64", "linux/arm64"]),
+            "heavy": LambdaConfig(path=tmp_path, type=ArtifactType.ZIP, requirements=tmp_path / "reqs.txt"),
+            "web": LambdaConfig(path=tmp_path, type=ArtifactType.ZIP),
+            "worker": LambdaConfig(path=tmp_path, type=ArtifactType.ZIP),
+        }
+    )
+
+def all_tasks(targets):
+    return [(t, p) for t in targets for p in t.platforms]
+
+def test_planner_shard_covers_all_tasks_once(tmp_path):
+    planner = Planner(make_shard_config(tmp_path))
+    tasks = all_tasks(planner.plan())
+
+    shards = [planner.shard(tasks, i, 3) for i in (1, 2, 3)]
+    labels = sorted(f"{t.name}@{p}" for shard in shards for t, p in shard)
+
+    assert labels == sorted(f"{t.name}@{p}" for t, p in tasks)
+    # Deterministic across invocations.
+    assert planner.shard(tasks, 2, 3) == shards[1]
+
+def test_planner_shard_spreads_lambdas_sharing_a_layer(tmp_path):
+    # Every lambda uses the one common layer; that must not pull them together.
+    both = ["linux/amd64", "linux/arm64"]
+    planner = Planner(PackageConfig(
+        layers={"common": LayerConfig(path=tmp_path, platforms=both)},
+        lambdas={
+            name: LambdaConfig(path=tmp_path, type=ArtifactType.ZIP, layers=["common"], platforms=both)
+            for name in ("a", "b", "c", "d", "e")
+        },
+    ))
+    tasks = all_tasks(planner.plan())
+
+    shards = [planner.shard(tasks, i, 3) for i in (1, 2, 3)]
+    sizes = [len(shard) for shard in shards]
+    assert sum(sizes) == len(tasks) == 12
+    assert sizes == [4, 4, 4]
+    for shard in shards:
+        assert any(t.type == "lambda" for t, _ in shard)
+        assert {p for _, p in shard} == set(both)
+
+def test_planner_shard_balances_cost(tmp_path):
+    planner = Planner(make_shard_config(tmp_path))
+    tasks = all_tasks(planner.plan())
+
+    # 'heavy' has three requirements, so it gets a shard to itself.
+    shard = planner.shard(tasks, 1, 3)
+    assert [t.name for t, _ in shard] == ["heavy"]
+
+def test_planner_shard_ignores_untracked_files(tmp_path):
+    cfg = make_shard_config(tmp_path)
+    for name in ("api", "heavy", "web", "worker"):
+        (tmp_path / name).mkdir()
+        cfg.lambdas[name].path = tmp_path / name
+    planner = Planner(cfg)
+    tasks = all_tasks(planner.plan())
+    before = [planner.shard(tasks, i, 3) for i in (1, 2, 3)]
+
+    # A node whose checkout has bytecode and a virtualenv under one lambda.
+    for junk in ("__pycache__/main.cpython-312.pyc", ".venv/lib/big.so"):
+        path = tmp_path / "worker" / junk
+        path.parent.mkdir(parents=True)
+        with open(path, "wb") as f:
+            f.truncate(50 << 20)
+
+    assert [planner.shard(tasks, i, 3) for i in (1, 2, 3)] == before
+
+def test_planner_shard_rejects_bad_index(tmp_path):
+    planner = Planner(make_shard_config(tmp_path))
+    with pytest.raises(ValueError):
+        planner.shard([], 0, 2)
@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+from lambda_packer.builders.pool import BuilderPool
+from lambda_packer.config import BuilderConfig
+
+def make_pool(emulate=True):
+    return BuilderPool([
+        BuilderConfig(name="amd", platforms=["linux/amd64"], concurrency=1, emulate=emulate),
+        BuilderConfig(name="arm", platforms=["linux/arm64"], concurrency=1, emulate=emulate),
+    ])
+
+def record_builders(mocker, gate=None):
+    used = []
+
+    def fake_build(self, platforms, **kwargs):
+        used.append((self.buildx_instance, platforms[0]))
+        if gate is not None:
+            gate.wait(timeout=5)
+
+    mocker.patch("lambda_packer.builders.buildkit.BuildKitBuilder.build", fake_build)
+    return used
+
+def test_pool_routes_to_native_builder(mocker):
+    used = record_builders(mocker)
+    pool = make_pool()
+
+    pool.build(platforms=["linux/arm64"], dockerfile_content="", context_path=None)
+    pool.build(platforms=["linux/amd64"], dockerfile_content="", context_path=None)
+
+    assert used == [("arm", "linux/arm64"), ("amd", "linux/amd64")]
+    report = pool.report()
+    assert report["arm"]["native_tasks"] == 1
+    assert report["amd"]["spilled_tasks"] == 0
+
+def test_pool_spills_over_when_native_builder_saturated(mocker, capsys):
+    gate = threading.Event()
+    used = record_builders(mocker, gate)
+    pool = make_pool()
+
+    first = threading.Thread(target=pool.build, kwargs={"platforms": ["linux/arm64"]})
+    first.start()
+    while not used:
+        time.sleep(0.01)
+    second = threading.Thread(target=pool.build, kwargs={"platforms": ["linux/arm64"]})
+    second.start()
+    while len(used) < 2:
+        time.sleep(0.01)
+    gate.set()
+    first.join()
+    second.join()
+
+    assert used == [("arm", "linux/arm64"), ("amd", "linux/arm64")]
+    assert "Builder 'amd' takes linux/arm64 (native builders saturated)" in capsys.readouterr().out
+    report = pool.report()
+    assert report["amd"]["spilled_tasks"] == 1
+    assert report["arm"]["peak_concurrency"] == 1
+
+def test_pool_waits_for_native_slot_without_emulation(mocker):
+    gate = threading.Event()
+    used = record_builders(mocker, gate)
+    pool = make_pool(emulate=False)
+
+    threads = [
+        threading.Thread(target=pool.build, kwargs={"platforms": ["linux/arm64"]})
+        for _ in range(2)
+    ]
+    for t in threads:
+        t.start()
+    while not used:
+        time.sleep(0.01)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert used == [("arm", "linux/arm64"), ("arm", "linux/arm64")]
+    assert pool.report()["arm"]["tasks"] == 2
+
+def test_pool_reports_missing_native_builder(mocker, capsys):
+    used = record_builders(mocker)
+    pool = make_pool()
+
+    pool.build(platforms=["linux/s390x"])
+
+    assert used == [("amd", "linux/s390x")]
+    assert "(no native builder configured)" in capsys.readouterr().out
+
+def test_pool_session_reports_its_own_tasks(mocker):
+    record_builders(mocker)
+    pool = make_pool()
+    pool.build(platforms=["linux/amd64"])
+
+    session = pool.session()
+    session.build(platforms=["linux/arm64"])
+
+    report = session.report()
+    assert report["arm"]["tasks"] == 1
+    assert report["amd"]["tasks"] == 0
+    assert pool.report()["amd"]["tasks"] == 1
+
+def test_pool_requires_builders():
+    with pytest.raises(ValueError):
+        BuilderPool([])
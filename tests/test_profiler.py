@@ -0,0 +1,60 @@
+import zipfile
+
+import pytest
+
+from lambda_packer.profiler import START_MARKER, ImportProfiler, parse_importtime
+
+def make_asset(root):
+    pkg = root / "heavy"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("from . import core\n")
+    (pkg / "core.py").write_text("VALUE = sum(range(100000))\n")
+    (root / "app.py").write_text("import heavy\n\ndef handler(event, context):\n    return heavy.core.VALUE\n")
+
+def test_parse_importtime_aggregates_top_level_packages():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       500 |        500 | encodings",
+        START_MARKER,
+        "import time:       100 |        100 |   heavy.core",
+        "import time:        50 |        150 | heavy",
+        "import time:      1000 |       1150 | app",
+    ])
+
+    result = parse_importtime(stderr)
+
+    # Startup imports before the marker are excluded.
+    assert result == {"total_ms": 1.15, "packages": {"app": 1.0, "heavy": 0.15}}
+
+def test_profile_asset_tree(tmp_path):
+    make_asset(tmp_path / "asset")
+
+    result = ImportProfiler().profile(tmp_path / "asset", "app.handler")
+
+    assert {"app", "heavy"} <= set(result["packages"])
+    assert "encodings" not in result["packages"]
+    assert result["total_ms"] > 0
+
+def test_profile_zip(tmp_path):
+    make_asset(tmp_path / "asset")
+    zip_path = tmp_path / "app.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        for path in (tmp_path / "asset").rglob("*.py"):
+            zf.write(path, path.relative_to(tmp_path / "asset"))
+
+    result = ImportProfiler().profile(zip_path, "app.handler")
+
+    assert {"app", "heavy"} <= set(result["packages"])
+
+def test_profile_reports_import_errors(tmp_path):
+    (tmp_path / "app.py").write_text("import does_not_exist\n")
+
+    with pytest.raises(RuntimeError, match="Importing 'app' failed"):
+        ImportProfiler().profile(tmp_path, "app.handler")
+
+def test_profile_ignores_host_site_packages(tmp_path):
+    # PyYAML is installed on the host, but not in the artifact.
+    (tmp_path / "app.py").write_text("import yaml\n")
+
+    with pytest.raises(RuntimeError, match="No module named 'yaml'"):
+        ImportProfiler().profile(tmp_path, "app.handler")
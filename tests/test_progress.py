@@ -0,0 +1,96 @@
+import json
+import subprocess
+
+import pytest
+
+from lambda_packer.builders.buildkit import BuildKitBuilder
+from lambda_packer.builders.progress import ProgressCollector, parse_timestamp, summarize_run
+
+RAWJSON = [
+    {"vertexes": [{"digest": "sha256:a", "name": "[internal] load build context", "started": "2024-05-01T10:00:00.000000000Z"}]},
+    {"statuses": [{"id": "transferring context", "vertex": "sha256:a", "current": 1024}]},
+    {"statuses": [{"id": "transferring context", "vertex": "sha256:a", "current": 4096}]},
+    {"vertexes": [{"digest": "sha256:a", "name": "[internal] load build context", "started": "2024-05-01T10:00:00.000000000Z", "completed": "2024-05-01T10:00:00.250000000Z"}]},
+    {"vertexes": [{"digest": "sha256:b", "name": "[builder 3/4] RUN pip install", "cached": True, "started": "2024-05-01T10:00:01Z", "completed": "2024-05-01T10:00:01Z"}]},
+    {"vertexes": [{"digest": "sha256:c", "name": "[builder 4/4] COPY src/ .", "started": "2024-05-01T10:00:01.5Z"}]},
+    {"vertexes": [{"digest": "sha256:c", "name": "[builder 4/4] COPY src/ .", "started": "2024-05-01T10:00:01.5Z", "completed": "2024-05-01T10:00:03.5Z"}]},
+]
+
+def test_parse_timestamp_nanoseconds():
+    assert parse_timestamp("1970-01-01T00:00:01.500000000Z") == 1.5
+    assert parse_timestamp("1970-01-01T01:00:01+01:00") == 1.0
+    assert parse_timestamp(None) is None
+
+def test_progress_collector_summary():
+    collector = ProgressCollector()
+    completed = []
+    for status in RAWJSON:
+        completed += collector.feed(json.dumps(status))
+    assert collector.feed("WARNING: not json") == []
+
+    assert [s["name"] for s in completed] == [
+        "[internal] load build context",
+        "[builder 3/4] RUN pip install",
+        "[builder 4/4] COPY src/ .",
+    ]
+
+    summary = collector.summary()
+    assert summary["total_steps"] == 3
+    assert summary["cached_steps"] == 1
+    assert summary["cache_hit_ratio"] == 0.333
+    assert summary["bytes"] == 4096
+    assert summary["steps"][0] == {
+        "name": "[internal] load build context",
+        "duration_s": 0.25,
+        "cached": False,
+        "bytes": 4096,
+    }
+    assert summary["steps"][2]["duration_s"] == 2.0
+
+def test_summarize_run():
+    collector = ProgressCollector()
+    for status in RAWJSON:
+        collector.feed(json.dumps(status))
+    summary = collector.summary()
+
+    run = summarize_run([("api (linux/amd64)", summary), ("api (linux/arm64)", summary)], slowest=1)
+
+    assert run["total_steps"] == 6
+    assert run["cached_steps"] == 2
+    assert run["bytes"] == 8192
+    assert run["slowest_steps"][0]["name"] == "[builder 4/4] COPY src/ ."
+    assert run["slowest_steps"][0]["target"] == "api (linux/amd64)"
+
+def test_buildkit_builder_reads_rawjson(tmp_path, mocker):
+    lines = [(json.dumps(status) + "\n").encode() for status in RAWJSON]
+    proc = mocker.MagicMock()
+    proc.__enter__.return_value = proc
+    proc.stderr = iter(lines)
+    proc.returncode = 0
+    popen = mocker.patch("lambda_packer.builders.progress.subprocess.Popen", return_value=proc)
+
+    metrics = BuildKitBuilder().build(
+        dockerfile_content="FROM scratch",
+        context_path=tmp_path,
+        platforms=["linux/amd64"],
+        output_dest=tmp_path / "out",
+    )
+
+    cmd = popen.call_args.args[0]
+    assert cmd[cmd.index("--progress") + 1] == "rawjson"
+    assert metrics["total_steps"] == 3
+
+def test_buildkit_builder_raises_on_failure(tmp_path, mocker):
+    proc = mocker.MagicMock()
+    proc.__enter__.return_value = proc
+    proc.stderr = iter([b"ERROR: failed to solve\n"])
+    proc.returncode = 1
+    mocker.patch("lambda_packer.builders.progress.subprocess.Popen", return_value=proc)
+
+    with pytest.raises(subprocess.CalledProcessError):
+        BuildKitBuilder().build(
+            dockerfile_content="FROM scratch",
+            context_path=tmp_path,
+            platforms=["linux/amd64"],
+            output_dest=tmp_path / "out",
+        )
@@ -0,0 +1,90 @@
+from lambda_packer.pruner import ReachabilityPruner
+
+def write(root, rel, content=""):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+def make_asset(root):
+    write(root, "app.py", "import importlib\nimport used\n\ndef handler(event, context):\n    return importlib.import_module(event['plugin'])\n")
+    write(root, "util.py")
+    write(root, "used/__init__.py", "from .core import VALUE\n")
+    write(root, "used/core.py", "import importlib\nfast = importlib.import_module('used.speedups')\nVALUE = 1\n")
+    write(root, "used/speedups.py")
+    write(root, "used/unused_sub.py", "import unused\n")
+    write(root, "used/data.json", "{}")
+    write(root, "unused/__init__.py", "x = 1\n")
+    write(root, "unused/assets/big.bin", "x" * 1000)
+    write(root, "plugins/__init__.py")
+    write(root, "plugins/dyn.py")
+    write(root, "used-1.0.dist-info/METADATA", "Name: used")
+
+def test_pruner_removes_unreachable_modules(tmp_path):
+    make_asset(tmp_path)
+
+    report = ReachabilityPruner(keep=["plugins.dyn"]).prune(tmp_path, "app.handler")
+
+    # The verification run must not leave bytecode behind in the asset tree.
+    remaining = sorted(str(p.relative_to(tmp_path)) for p in tmp_path.rglob("*") if p.is_file())
+    assert remaining == [
+        "app.py",
+        "plugins/__init__.py",
+        "plugins/dyn.py",
+        "used-1.0.dist-info/METADATA",
+        "used/__init__.py",
+        "used/core.py",
+        "used/data.json",
+        "used/speedups.py",
+        "util.py",
+    ]
+    assert report["removed_files"] == 3
+    assert report["removed_bytes"] == len("import unused\n") + len("x = 1\n") + 1000
+    assert report["verified"] is True
+    assert not (tmp_path / "unused").exists()
+
+def test_pruner_follows_relative_and_from_imports(tmp_path):
+    write(tmp_path, "app.py", "from pkg import sub\n")
+    write(tmp_path, "pkg/__init__.py")
+    write(tmp_path, "pkg/sub.py", "from ..pkg.deep import thing\nfrom . import sibling\n")
+    write(tmp_path, "pkg/sibling.py")
+    write(tmp_path, "pkg/deep/__init__.py", "thing = 1\n")
+    write(tmp_path, "pkg/other.py")
+
+    report = ReachabilityPruner(verify=False).prune(tmp_path, "app.handler")
+
+    assert report["removed_files"] == 1
+    assert not (tmp_path / "pkg" / "other.py").exists()
+    assert (tmp_path / "pkg" / "sibling.py").exists()
+
+def test_pruner_keeps_whole_package_of_extensions(tmp_path):
+    write(tmp_path, "app.py", "import native\n")
+    write(tmp_path, "native/__init__.py", "from ._core import f\n")
+    write(tmp_path, "native/_core.cpython-312-x86_64-linux-gnu.so", "binary")
+    write(tmp_path, "native/helpers.py")
+
+    report = ReachabilityPruner(verify=False).prune(tmp_path, "app.handler")
+
+    assert report["removed_files"] == 0
+    assert (tmp_path / "native" / "helpers.py").exists()
+
+def test_pruner_reverts_when_verification_fails(tmp_path):
+    write(tmp_path, "app.py", "import importlib\nname = 'dyn' + 'amic'\nimportlib.import_module(name)\n")
+    write(tmp_path, "dynamic/__init__.py")
+
+    report = ReachabilityPruner().prune(tmp_path, "app.handler")
+
+    assert report["removed_files"] == 0
+    assert report["verified"] is False
+    assert (tmp_path / "dynamic" / "__init__.py").exists()
+
+def test_pruner_verification_ignores_host_packages(tmp_path):
+    # 'yaml' is hidden from the static walk and also installed on the host;
+    # verification must not be satisfied by the host's copy.
+    write(tmp_path, "app.py", "import importlib\nimportlib.import_module('ya' + 'ml')\n\ndef handler(event, context):\n    pass\n")
+    write(tmp_path, "yaml/__init__.py", "SHIPPED = True\n")
+
+    report = ReachabilityPruner().prune(tmp_path, "app.handler")
+
+    assert report["removed_files"] == 0
+    assert not report["verified"]
+    assert (tmp_path / "yaml" / "__init__.py").exists()